@@ -1,19 +1,55 @@
 # main.py
+import os
+from functools import partial
+
+import pandas as pd
 import streamlit as st
+from streamlit.runtime import Runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 from src.sidebar import render_sidebar
-from src.engine import run_simulation
-from src.plotting import create_nav_chart, create_liquidity_runway
+from src.engine import run_simulation_with_summary
+from src.export import results_bytes
+from src.jobs import Job, JobManager, fingerprint
+from src.models import SimulationInputs, SimulationSummary
+from src.montecarlo import MarketAssumptions, run_monte_carlo
+from src.plotting import create_fan_chart, create_nav_chart, create_liquidity_runway
 from src.utils import format_currency
 
+MONTE_CARLO_PATHS = (10_000, 50_000, 200_000, 1_000_000)
+MONTE_CARLO_CHUNK = 10_000
 
-def main():
-    st.set_page_config(page_title="FIRE Master Calculator", layout="wide")
-    st.title("🔥 Modular FIRE Calculator")
 
-    inputs = render_sidebar()
-    df_results = run_simulation(inputs)
+# --- CACHED COMPUTATION ---
+# Every widget interaction reruns this script. The engine and the chart builders
+# are memoized on their explicit inputs, so a rerun triggered by an unrelated
+# widget (or a burst of identical values from the +/- steppers) is a cache hit
+# and only a genuinely new configuration pays for an engine run.
+@st.cache_data(max_entries=64, show_spinner=False)
+def simulate(inputs: SimulationInputs) -> tuple[pd.DataFrame, SimulationSummary]:
+    return run_simulation_with_summary(inputs)
 
-    # --- FEATURE: CONFIGURATION SNAPSHOT ---
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def nav_chart(df_results: pd.DataFrame, retire_age: int):
+    return create_nav_chart(df_results, retire_age)
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def runway_chart(df_results: pd.DataFrame, retire_age: int, payout_age: int):
+    return create_liquidity_runway(df_results, retire_age, payout_age)
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def export_results(
+    df_results: pd.DataFrame,
+    inputs: SimulationInputs,
+    summary: SimulationSummary,
+    format: str,
+):
+    return results_bytes(df_results, inputs, format, summary)
+
+
+def render_config_snapshot(inputs: SimulationInputs, summary: SimulationSummary):
     with st.expander(
         "📝 View Configuration (Click to Expand for Screenshot)", expanded=False
     ):
@@ -43,21 +79,13 @@ def main():
             st.write(f"**Unlock:** {format_currency(inputs.spend_unlock)}/m")
             st.write(f"**Late:** {format_currency(inputs.spend_late)}/m")
 
-            # CPF LIFE DISPLAY WITH TODAY'S VALUE FIX
-            payout_row = df_results[df_results["Age"] == inputs.payout_age]
-            if not payout_row.empty:
-                annual_payout = payout_row.iloc[0]["CPF_Life_Payout_Annual"]
-                monthly_payout = annual_payout / 12
-
-                # Calculate Real Value (Today's Dollars)
-                years_to_payout = inputs.payout_age - inputs.current_age
-                real_monthly_payout = monthly_payout / (
-                    (1 + inputs.inflation_rate) ** years_to_payout
+            # CPF LIFE DISPLAY (engine reports both nominal and today's value)
+            if summary.cpf_life_monthly_nominal is not None:
+                st.write(
+                    f"**CPF Life (Nominal):** {format_currency(summary.cpf_life_monthly_nominal)}/m"
                 )
-
-                st.write(f"**CPF Life (Nominal):** {format_currency(monthly_payout)}/m")
                 st.write(
-                    f"**CPF Life (Today's Value):** {format_currency(real_monthly_payout)}/m"
+                    f"**CPF Life (Today's Value):** {format_currency(summary.cpf_life_monthly_real)}/m"
                 )
                 st.caption(
                     f"*(Buying power in today's dollars at Age {inputs.payout_age})*"
@@ -80,60 +108,181 @@ def main():
             if inputs.car_downpayment > 0:
                 st.caption(f"↳ Downpayment: {format_currency(inputs.car_downpayment)}")
 
+            if inputs.events:
+                st.write(f"**Life Events:** {len(inputs.events)}")
             st.write(f"**RA Target:** {format_currency(inputs.ra_target)}")
             st.write(f"**Payout Age:** {inputs.payout_age}")
 
-    # --- MAIN DASHBOARD ---
-    col1, col2 = st.columns([3, 1])
 
-    with col1:
-        st.subheader("📊 Net Worth Projection")
-        st.plotly_chart(
-            create_nav_chart(df_results, inputs.retire_age), width="stretch"
-        )
+def render_charts(inputs: SimulationInputs, df_results: pd.DataFrame):
+    st.subheader("📊 Net Worth Projection")
+    st.plotly_chart(nav_chart(df_results, inputs.retire_age), width="stretch")
+
+    st.subheader("🛣️ Liquidity Runway (The 3 Phases)")
+    st.caption(
+        "This chart shows exactly how much money is 'unlocked' and available to spend in each phase."
+    )
+    st.plotly_chart(
+        runway_chart(df_results, inputs.retire_age, inputs.payout_age),
+        width="stretch",
+    )
+
 
-        st.subheader("🛣️ Liquidity Runway (The 3 Phases)")
-        st.caption(
-            "This chart shows exactly how much money is 'unlocked' and available to spend in each phase."
+def render_downloads(
+    inputs: SimulationInputs, df_results: pd.DataFrame, summary: SimulationSummary
+):
+    st.subheader("📥 Export Results")
+    st.caption(
+        "Year-by-year results with your inputs and key stats embedded "
+        "(pandas, DuckDB...)"
+    )
+    for format, label in [("parquet", "Parquet"), ("feather", "Arrow / Feather")]:
+        # Built only when the button is clicked, not on every rerun
+        st.download_button(
+            label,
+            data=partial(export_results, df_results, inputs, summary, format),
+            file_name=f"fire_results.{format}",
+            mime="application/octet-stream",
+            key=f"download_{format}",
         )
-        st.plotly_chart(
-            create_liquidity_runway(df_results, inputs.retire_age, inputs.payout_age),
-            width="stretch",
+
+
+def render_key_stats(summary: SimulationSummary):
+    st.subheader("🔎 Key Stats")
+
+    if summary.net_worth_at_retire is not None:
+        st.metric("Net Worth @ Retire", format_currency(summary.net_worth_at_retire))
+        st.metric("Bridge Cash Start", format_currency(summary.bridge_cash_start))
+
+    if summary.cpf_surplus_at_55 is not None:
+        # Bridge fails if no cash is left at 54 (or age 54 was never simulated)
+        bridge_safe = bool(summary.bridge_safe)
+        cash_left = summary.bridge_cash_left or 0.0
+
+        st.metric(
+            "Bridge Outcome (Age 55)",
+            "SAFE" if bridge_safe else "FAILED",
+            delta=f"Cash Left: {format_currency(cash_left)}",
+            delta_color="normal" if bridge_safe else "inverse",
         )
 
-    with col2:
-        st.subheader("🔎 Key Stats")
+        st.metric("CPF Surplus Unlocked", format_currency(summary.cpf_surplus_at_55))
+
+    if summary.depletion_age is not None:
+        st.metric("Money Runs Out", f"Age {summary.depletion_age}")
 
-        def get_row(age):
-            row = df_results[df_results["Age"] == age]
-            return row.iloc[0] if not row.empty else None
 
-        retire_row = get_row(inputs.retire_age)
-        if retire_row is not None:
-            st.metric("Net Worth @ Retire", format_currency(retire_row["Net_Worth"]))
-            st.metric(
-                "Bridge Cash Start", format_currency(retire_row["Liquid_Cash_Balance"])
+# --- BACKGROUND JOBS ---
+# Monte Carlo runs take seconds, so they go to a JobManager instead of blocking
+# the script. One manager (and thread pool) serves every session; each session
+# owns the slot (session id, "monte_carlo"). A job is keyed by its inputs:
+# editing the sidebar supersedes (cancels) the running job and queues one for
+# the new inputs, while the deterministic charts keep rendering from the cache.
+# Jobs of closed sessions are cancelled and dropped by the reaper.
+def _session_alive(slot) -> bool:
+    if not Runtime.exists():
+        return True  # bare mode / AppTest: no session registry to ask
+    return Runtime.instance().is_active_session(slot[0])
+
+
+@st.cache_resource
+def job_manager() -> JobManager:
+    jobs = JobManager(max_workers=os.cpu_count() or 1)
+    jobs.start_reaper(_session_alive)
+    return jobs
+
+
+def monte_carlo_slot() -> tuple:
+    return (get_script_run_ctx().session_id, "monte_carlo")
+
+
+def submit_monte_carlo(inputs: SimulationInputs, n_paths: int) -> Job:
+    assumptions = MarketAssumptions()
+    return job_manager().submit(
+        monte_carlo_slot(),
+        fingerprint(inputs, assumptions, n_paths),
+        run_monte_carlo,
+        inputs,
+        assumptions,
+        n_paths,
+        # At least ~20 chunks so progress moves and cancelling is quick, but
+        # capped so peak memory stays independent of n_paths
+        chunk_size=min(max(n_paths // 20, 1_000), MONTE_CARLO_CHUNK),
+    )
+
+
+def _stop_monte_carlo():
+    st.session_state["mc_enabled"] = False
+    job_manager().cancel(monte_carlo_slot())
+
+
+@st.fragment(run_every=0.5)
+def render_job_progress(job: Job):
+    # Polls only this fragment; a full rerun delivers the result once finished
+    if not job.active:
+        st.rerun()
+    st.progress(
+        job.fraction,
+        text=f"Simulating... {job.done}/{job.total or '?'} chunks ({job.elapsed:.0f}s)",
+    )
+    st.button("Cancel", on_click=_stop_monte_carlo, key="mc_cancel")
+
+
+def render_monte_carlo(inputs: SimulationInputs):
+    st.subheader("🎲 Market Uncertainty (Monte Carlo)")
+    c1, c2 = st.columns([1, 3])
+    with c1:
+        enabled = st.toggle("Run in background", key="mc_enabled")
+        n_paths = st.select_slider("Paths", MONTE_CARLO_PATHS, key="mc_paths")
+
+    with c2:
+        if not enabled:
+            job_manager().cancel(monte_carlo_slot())
+            st.caption(
+                "Samples yearly returns and inflation around your expected rates "
+                "and shows the range of outcomes in today's dollars."
             )
+            return
 
-        age55_row = get_row(55)
-        if age55_row is not None:
-            # Check if Bridge Failed (Cash at 54 should be > 0)
-            row_54 = get_row(54)
-            bridge_safe = (
-                row_54["Liquid_Cash_Balance"] > 0 if row_54 is not None else False
+        job = submit_monte_carlo(inputs, n_paths)
+        if job.active:
+            render_job_progress(job)
+        elif job.status == "failed":
+            st.error(f"Monte Carlo run failed: {job.future.exception()}")
+        elif job.status == "done":
+            result = job.future.result()
+            st.metric("Success Rate", f"{result.success_rate:.1%}")
+            st.plotly_chart(
+                create_fan_chart(result.percentiles, inputs.retire_age),
+                width="stretch",
+            )
+            st.caption(
+                f"{result.n_paths:,} paths in {job.elapsed:.1f}s · percentiles "
+                f"within {result.rel_error_bound:.2%}"
             )
 
-            cash_left = row_54["Liquid_Cash_Balance"]
 
-            st.metric(
-                "Bridge Outcome (Age 55)",
-                "SAFE" if bridge_safe else "FAILED",
-                delta=f"Cash Left: {format_currency(cash_left)}",
-                delta_color="normal" if bridge_safe else "inverse",
-            )
+def main():
+    st.set_page_config(page_title="FIRE Master Calculator", layout="wide")
+    st.title("🔥 Modular FIRE Calculator")
+
+    inputs = render_sidebar()
+    df_results, summary = simulate(inputs)
+
+    # --- FEATURE: CONFIGURATION SNAPSHOT ---
+    render_config_snapshot(inputs, summary)
+
+    # --- MAIN DASHBOARD ---
+    col1, col2 = st.columns([3, 1])
+
+    with col1:
+        render_charts(inputs, df_results)
+
+    with col2:
+        render_key_stats(summary)
+        render_downloads(inputs, df_results, summary)
 
-            surplus = age55_row["OA_Total"] + age55_row["SA_Total"]
-            st.metric("CPF Surplus Unlocked", format_currency(surplus))
+    render_monte_carlo(inputs)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,489 @@
+# src/batch.py
+import dataclasses
+from dataclasses import dataclass
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from src.constants import SA_BASE_RATE, OA_BASE_RATE, SCENARIO_FACTORS
+from src.closed_form import quiet_runs
+from src.events import build_schedule, house_payment
+from src.models import SimulationInputs
+from src.parallel import Shard, ShardedRunner, make_shards
+
+
+@dataclass
+class RatePaths:
+    # Per-path, per-year rates, each shaped (n_paths, n_years). Year t of a path
+    # uses column t; inflation in column t deflates the *following* year.
+    cash_apy: np.ndarray
+    oa_apy: np.ndarray
+    sa_apy: np.ndarray
+    inflation_rate: np.ndarray
+
+    @property
+    def n_paths(self) -> int:
+        return self.cash_apy.shape[0]
+
+    @classmethod
+    def constant(cls, inputs: SimulationInputs, n_paths: int = 1) -> "RatePaths":
+        """Broadcasts the scalar rates of `inputs` to every path and year."""
+        shape = (n_paths, max(inputs.life_expectancy - inputs.current_age + 1, 0))
+        return cls(
+            cash_apy=np.full(shape, inputs.cash_apy),
+            oa_apy=np.full(shape, inputs.oa_apy),
+            sa_apy=np.full(shape, inputs.sa_apy),
+            inflation_rate=np.full(shape, inputs.inflation_rate),
+        )
+
+    @classmethod
+    def from_cube(
+        cls, cube: np.ndarray, n_years: int, start: int = 0, stop=None
+    ) -> "RatePaths":
+        """
+        Views paths [start:stop] and the first `n_years` years of a
+        (paths, years, factors) scenario cube; no data is copied, so a
+        memory-mapped cube is only paged in as the engine reads it.
+        """
+        if cube.shape[1] < n_years:
+            raise ValueError(
+                f"Scenario cube covers {cube.shape[1]} years, need {n_years}"
+            )
+        block = cube[start:stop, :n_years]
+        return cls(**{name: block[:, :, i] for i, name in enumerate(SCENARIO_FACTORS)})
+
+
+@dataclass
+class BatchResult:
+    ages: np.ndarray
+    # Same columns as run_simulation, each shaped (n_paths, n_years)
+    columns: dict
+    # Per-path SimulationSummary KPIs, each shaped (n_paths,). NaN where the
+    # engine's field would be None (never depleted, age outside the horizon).
+    # First retired age with no accessible liquidity
+    depletion_age: np.ndarray
+    min_accessible_liquidity: np.ndarray
+    net_worth_at_retire: np.ndarray
+    bridge_cash_start: np.ndarray
+    bridge_cash_left: np.ndarray
+    cpf_surplus_at_55: np.ndarray
+    cpf_life_monthly_nominal: np.ndarray
+    cpf_life_monthly_real: np.ndarray
+
+    @property
+    def bridge_safe(self) -> np.ndarray:
+        """Cash left at 54 per path (False where 54 is outside the horizon)."""
+        return self.bridge_cash_left > 0
+
+    def compact(self, dtype=np.float32) -> "BatchResult":
+        """
+        Copy with every column stored as `dtype`. Integer dtypes keep whole
+        dollars, clipped to the dtype's range (int32 covers +/- $2.1bn).
+        """
+        dtype = np.dtype(dtype)
+        if dtype.kind in "iu":
+            info = np.iinfo(dtype)
+            columns = {
+                name: np.clip(np.rint(values), info.min, info.max).astype(dtype)
+                for name, values in self.columns.items()
+            }
+        else:
+            columns = {
+                name: values.astype(dtype) for name, values in self.columns.items()
+            }
+        return dataclasses.replace(self, columns=columns)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(values.nbytes for values in self.columns.values())
+
+
+def _compound_paths(balance: np.ndarray, topup: float, rates: np.ndarray):
+    """
+    Per-path balances after each year of b -> (b + topup) * (1 + r_k), with
+    growth G_k = prod(1 + r_1..r_k): b_k = G_k * (b_0 + topup * sum 1 / G_{j-1}).
+    Always accumulated in float64, whatever the batch dtype.
+    """
+    growth = np.cumprod(1 + rates.astype(np.float64), axis=1)
+    prior = np.concatenate([np.ones((len(balance), 1)), growth[:, :-1]], axis=1)
+    start = balance.astype(np.float64)[:, None]
+    return growth * (start + topup * np.cumsum(1 / prior, axis=1))
+
+
+def run_batch(
+    inputs: SimulationInputs,
+    rates: RatePaths,
+    closed_form: bool = True,
+    dtype=np.float64,
+) -> BatchResult:
+    """
+    Vectorized run_simulation: steps every path through the year loop at once.
+
+    Spending, top-ups, loans, life events and CPF rules come from `inputs`;
+    only the growth and inflation rates vary by path. The withdrawal order is
+    fixed up-front from the expected rates in `inputs`, so each path follows
+    the same plan.
+    `closed_form` jumps across event-free working years, one array update
+    per span for every path (see run_simulation_with_summary).
+
+    `dtype` sets the state and output precision. With np.float32 the per-year
+    state and all output columns take half the memory, while the compounding
+    products (deflators, closed-form growth) are still accumulated in float64
+    and rounded once; see precision_report for the resulting error.
+    """
+    ages = np.arange(inputs.current_age, inputs.life_expectancy + 1)
+    n = rates.n_paths
+    n_years = len(ages)
+    rates = RatePaths(
+        cash_apy=np.asarray(rates.cash_apy, dtype=dtype),
+        oa_apy=np.asarray(rates.oa_apy, dtype=dtype),
+        sa_apy=np.asarray(rates.sa_apy, dtype=dtype),
+        inflation_rate=rates.inflation_rate,
+    )
+
+    curr_sa = np.full(n, inputs.sa_bal, dtype=dtype)
+    curr_sa_inv = np.full(n, inputs.sa_inv, dtype=dtype)
+    curr_oa = np.full(n, inputs.oa_bal, dtype=dtype)
+    curr_oa_inv = np.full(n, inputs.oa_inv, dtype=dtype)
+    curr_cash = np.full(n, inputs.cash_inv, dtype=dtype)
+
+    frs_balance = np.zeros(n, dtype=dtype)
+    cpf_life_annual_payout = np.zeros(n, dtype=dtype)
+    frs_locked = False
+    deflators64 = np.cumprod(
+        np.concatenate(
+            [
+                np.ones((n, 1)),
+                1 + np.asarray(rates.inflation_rate[:, : n_years - 1], np.float64),
+            ],
+            axis=1,
+        ),
+        axis=1,
+    )
+    deflators = deflators64.astype(dtype, copy=False)
+
+    # Plain Python floats keep float32 arithmetic from being promoted
+    house_pmt = float(house_payment(inputs))
+    schedule = build_schedule(inputs)
+    runs = quiet_runs(inputs, house_pmt, schedule)
+    cash_events = schedule.cash.tolist()
+    oa_events = schedule.oa.tolist()
+    sa_events = schedule.sa.tolist()
+    spend_events = schedule.spend.tolist()
+
+    # Withdrawal plan: lowest expected yield first (stable, as in the engine)
+    unlocked_order = [
+        acc_id
+        for acc_id, _ in sorted(
+            [
+                ("cash", inputs.cash_apy),
+                ("oa_liq", OA_BASE_RATE),
+                ("oa_inv", inputs.oa_apy),
+                ("sa_liq", SA_BASE_RATE),
+                ("sa_inv", inputs.sa_apy),
+            ],
+            key=lambda x: x[1],
+        )
+    ]
+
+    out = {
+        name: np.empty((n, n_years), dtype=dtype)
+        for name in [
+            "Liquid_Cash_Balance",
+            "OA_Total",
+            "SA_Total",
+            "FRS_RA",
+            "Net_Worth",
+            "Accessible_Liquidity",
+            "Phase_Target",
+            "CPF_Life_Payout_Annual",
+        ]
+    }
+    depletion_age = np.full(n, np.nan)
+    min_accessible = np.full(n, np.nan)
+
+    t = 0
+    while t < n_years:
+        age = int(ages[t])
+
+        # Closed-form jump across event-free working years
+        span = runs[t] if closed_form else 0
+        if span > 1:
+            cols = slice(t, t + span)
+            cash = _compound_paths(
+                curr_cash, inputs.cash_topup * 12, rates.cash_apy[:, cols]
+            )
+            oa_inv = _compound_paths(
+                curr_oa_inv, inputs.oa_topup * 12, rates.oa_apy[:, cols]
+            )
+            sa_inv = _compound_paths(
+                curr_sa_inv, inputs.sa_topup * 12, rates.sa_apy[:, cols]
+            )
+            ks = np.arange(1, span + 1)
+            oa = curr_oa[:, None] * (1 + OA_BASE_RATE) ** ks
+            sa = curr_sa[:, None] * (1 + SA_BASE_RATE) ** ks
+
+            cash_bal = np.maximum(0, cash)
+            out["Liquid_Cash_Balance"][:, cols] = cash_bal
+            out["OA_Total"][:, cols] = oa + oa_inv
+            out["SA_Total"][:, cols] = sa + sa_inv
+            out["FRS_RA"][:, cols] = frs_balance[:, None]
+            out["Net_Worth"][:, cols] = (
+                cash_bal + oa + oa_inv + sa + sa_inv + frs_balance[:, None]
+            )
+            out["Accessible_Liquidity"][:, cols] = cash_bal
+            out["Phase_Target"][:, cols] = inputs.spend_bridge
+            out["CPF_Life_Payout_Annual"][:, cols] = cpf_life_annual_payout[:, None]
+
+            curr_cash = cash[:, -1].astype(dtype)
+            curr_oa_inv = oa_inv[:, -1].astype(dtype)
+            curr_sa_inv = sa_inv[:, -1].astype(dtype)
+            curr_oa = oa[:, -1].astype(dtype)
+            curr_sa = sa[:, -1].astype(dtype)
+            t += span
+            continue
+
+        is_retired = age >= inputs.retire_age
+
+        # 0. Spending Targets
+        if age < 55:
+            target_spend_today = inputs.spend_bridge
+        elif age < inputs.payout_age:
+            target_spend_today = inputs.spend_unlock
+        else:
+            target_spend_today = inputs.spend_late
+        if spend_events[t]:
+            target_spend_today = max(0, target_spend_today + spend_events[t])
+
+        annual_spend_nominal = target_spend_today * 12 * deflators[:, t]
+
+        # 1. Inflows
+        if not is_retired:
+            curr_sa_inv = curr_sa_inv + inputs.sa_topup * 12
+            curr_oa_inv = curr_oa_inv + inputs.oa_topup * 12
+            curr_cash = curr_cash + inputs.cash_topup * 12
+
+        # 2. Growth
+        curr_sa_inv = curr_sa_inv * (1 + rates.sa_apy[:, t])
+        curr_oa_inv = curr_oa_inv * (1 + rates.oa_apy[:, t])
+        curr_cash = curr_cash * (1 + rates.cash_apy[:, t])
+        curr_sa = curr_sa * (1 + SA_BASE_RATE)
+        curr_oa = curr_oa * (1 + OA_BASE_RATE)
+
+        # 3. Withdrawals
+        if is_retired:
+            spend_needed = annual_spend_nominal
+            if age >= inputs.payout_age:
+                spend_needed = np.maximum(0, spend_needed - cpf_life_annual_payout)
+
+            balances = {
+                "cash": curr_cash,
+                "oa_liq": curr_oa,
+                "oa_inv": curr_oa_inv,
+                "sa_liq": curr_sa,
+                "sa_inv": curr_sa_inv,
+            }
+            order = unlocked_order if age >= 55 else ["cash"]
+            for acc_id in order:
+                take = np.where(
+                    spend_needed > 0, np.minimum(balances[acc_id], spend_needed), 0
+                )
+                balances[acc_id] = balances[acc_id] - take
+                spend_needed = spend_needed - take
+
+            curr_cash = balances["cash"]
+            curr_oa = balances["oa_liq"]
+            curr_oa_inv = balances["oa_inv"]
+            curr_sa = balances["sa_liq"]
+            curr_sa_inv = balances["sa_inv"]
+
+        # 4. Life events, then the mortgage (OA first)
+        curr_cash = curr_cash + cash_events[t]
+        curr_oa_inv = curr_oa_inv + oa_events[t]
+        curr_sa_inv = curr_sa_inv + sa_events[t]
+
+        if (
+            inputs.house_start_age
+            <= age
+            < (inputs.house_start_age + inputs.house_tenure)
+        ):
+            from_oa = curr_oa >= house_pmt
+            from_oa_inv = ~from_oa & ((curr_oa + curr_oa_inv) >= house_pmt)
+            from_cash = ~from_oa & ~from_oa_inv
+
+            remaining = house_pmt - curr_oa - curr_oa_inv
+            curr_oa_inv = np.where(
+                from_oa_inv,
+                curr_oa_inv - (house_pmt - curr_oa),
+                np.where(from_cash, 0, curr_oa_inv),
+            )
+            curr_oa = np.where(from_oa, curr_oa - house_pmt, 0)
+            curr_cash = np.where(from_cash, curr_cash - remaining, curr_cash)
+
+        # 5. RA Logic: Transfer at 55
+        if age == 55 and not frs_locked:
+            needed = np.full(n, inputs.ra_target, dtype=dtype)
+
+            take = np.where(needed > 0, np.minimum(curr_sa, needed), 0)
+            curr_sa = curr_sa - take
+            frs_balance = frs_balance + take
+            needed = needed - take
+
+            take = np.where(needed > 0, np.minimum(curr_sa_inv, needed), 0)
+            curr_sa_inv = curr_sa_inv - take
+            frs_balance = frs_balance + take
+            needed = needed - take
+
+            take = np.where(needed > 0, np.minimum(curr_oa, needed), 0)
+            curr_oa = curr_oa - take
+            frs_balance = frs_balance + take
+            needed = needed - take
+
+            take = np.where(needed > 0, np.minimum(curr_oa_inv, needed), 0)
+            curr_oa_inv = curr_oa_inv - take
+            frs_balance = frs_balance + take
+            frs_locked = True
+
+        if frs_locked and age < inputs.payout_age:
+            frs_balance = frs_balance * 1.04
+
+        if age == inputs.payout_age:
+            deferral_bonus = 1.0 + ((age - 65) * 0.07)
+            base_payout_rate = 0.075
+            starts = frs_balance > 0
+            cpf_life_annual_payout = np.where(
+                starts,
+                frs_balance * base_payout_rate * deferral_bonus,
+                cpf_life_annual_payout,
+            )
+            frs_balance = np.where(starts, 0.0, frs_balance)
+
+        cash_bal = np.maximum(0, curr_cash)
+        oa_total = curr_oa + curr_oa_inv
+        sa_total = curr_sa + curr_sa_inv
+        net_worth = cash_bal + oa_total + sa_total + frs_balance
+        accessible = cash_bal if age < 55 else cash_bal + oa_total + sa_total
+
+        # 6. KPIs
+        if is_retired:
+            min_accessible = np.fmin(min_accessible, accessible)
+            depletion_age = np.where(
+                np.isnan(depletion_age) & (accessible <= 0), age, depletion_age
+            )
+
+        out["Liquid_Cash_Balance"][:, t] = cash_bal
+        out["OA_Total"][:, t] = oa_total
+        out["SA_Total"][:, t] = sa_total
+        out["FRS_RA"][:, t] = frs_balance
+        out["Net_Worth"][:, t] = net_worth
+        out["Accessible_Liquidity"][:, t] = accessible
+        out["Phase_Target"][:, t] = target_spend_today
+        out["CPF_Life_Payout_Annual"][:, t] = cpf_life_annual_payout
+        t += 1
+
+    # Same balances deflated to today's dollars
+    for name in [
+        "Liquid_Cash_Balance",
+        "OA_Total",
+        "SA_Total",
+        "FRS_RA",
+        "Net_Worth",
+        "Accessible_Liquidity",
+        "CPF_Life_Payout_Annual",
+    ]:
+        out[f"{name}_Real"] = (out[name] / deflators64).astype(dtype, copy=False)
+
+    def at_age(name: str, age: int) -> np.ndarray:
+        if not inputs.current_age <= age <= inputs.life_expectancy:
+            return np.full(n, np.nan)
+        return out[name][:, age - inputs.current_age].astype(np.float64)
+
+    payout_age = inputs.payout_age
+    return BatchResult(
+        ages=ages,
+        columns=out,
+        depletion_age=depletion_age,
+        min_accessible_liquidity=min_accessible,
+        net_worth_at_retire=at_age("Net_Worth", inputs.retire_age),
+        bridge_cash_start=at_age("Liquid_Cash_Balance", inputs.retire_age),
+        bridge_cash_left=at_age("Liquid_Cash_Balance", 54),
+        cpf_surplus_at_55=at_age("OA_Total", 55) + at_age("SA_Total", 55),
+        cpf_life_monthly_nominal=at_age("CPF_Life_Payout_Annual", payout_age) / 12,
+        cpf_life_monthly_real=at_age("CPF_Life_Payout_Annual_Real", payout_age) / 12,
+    )
+
+
+def precision_report(
+    inputs: SimulationInputs,
+    rates: RatePaths,
+    sample: int = 1000,
+    dtype=np.float32,
+) -> pd.DataFrame:
+    """
+    Runs the first `sample` paths of `rates` at `dtype` and at the float64
+    reference and reports, per output column, the largest absolute deviation
+    and the largest deviation relative to max(|reference|, $1), so balances
+    that drain to ~0 do not blow up the ratio, plus each column's footprint
+    per path at `dtype` and at float64.
+    """
+    rates = RatePaths(
+        **{
+            name: getattr(rates, name)[:sample]
+            for name in ("cash_apy", "oa_apy", "sa_apy", "inflation_rate")
+        }
+    )
+    reference = run_batch(inputs, rates)
+    reduced = run_batch(inputs, rates, dtype=dtype)
+
+    rows = []
+    for name, expected in reference.columns.items():
+        error = np.abs(reduced.columns[name].astype(np.float64) - expected)
+        scale = np.maximum(np.abs(expected), 1.0)
+        rows.append(
+            {
+                "Column": name,
+                "Max_Abs_Error": float(error.max(initial=0.0)),
+                "Max_Rel_Error": float((error / scale).max(initial=0.0)),
+                "Bytes_Per_Path": reduced.columns[name][0].nbytes,
+                "Reference_Bytes_Per_Path": expected[0].nbytes,
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def _sweep_shard(column: str, dtype, shard: Shard, out: np.ndarray):
+    for row, inputs in enumerate(shard.items):
+        result = run_batch(inputs, RatePaths.constant(inputs), dtype=dtype)
+        values = result.columns[column][0]
+        out[row, : len(values)] = values
+
+
+def run_sweep(
+    scenarios: list,
+    column: str = "Net_Worth",
+    shard_size: int = 256,
+    workers: int = 1,
+    progress=None,
+    cancel=None,
+    dtype=np.float64,
+) -> np.ndarray:
+    """
+    Runs every SimulationInputs in `scenarios` and returns `column` as an
+    (n_scenarios, n_years) array indexed by year offset from each scenario's
+    current_age. Shorter horizons are padded with NaN. Shards write straight
+    into a shared result block, so nothing large is pickled back.
+    `dtype` is passed to run_batch and also sets the result block's dtype,
+    so np.float32 halves the shared memory of large sweeps.
+    """
+    n_years = max(s.life_expectancy - s.current_age + 1 for s in scenarios)
+    out = ShardedRunner(max_workers=workers, progress=progress, cancel=cancel).run(
+        partial(_sweep_shard, column, dtype),
+        make_shards(len(scenarios), shard_size, items=scenarios),
+        shape=(len(scenarios), n_years),
+        dtype=dtype,
+    )
+    # Padding is applied after the merge so shards only touch their own cells
+    for row, s in enumerate(scenarios):
+        out[row, s.life_expectancy - s.current_age + 1 :] = np.nan
+    return out
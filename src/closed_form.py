@@ -0,0 +1,43 @@
+# src/closed_form.py
+import numpy as np
+
+from src.events import EventSchedule
+from src.models import SimulationInputs
+
+
+def quiet_runs(
+    inputs: SimulationInputs, house_pmt: float, schedule: EventSchedule
+) -> list:
+    """
+    For each year, how many consecutive years from it the loop would only add
+    top-ups and compound: still working, before 55, no mortgage payment, no
+    scheduled event and not the payout age. Such runs have a closed form
+    (see compound).
+    """
+    ages = np.arange(inputs.current_age, inputs.life_expectancy + 1)
+    in_house_loan = (inputs.house_start_age <= ages) & (
+        ages < inputs.house_start_age + inputs.house_tenure
+    )
+    quiet = (
+        (ages < inputs.retire_age)
+        & (ages < 55)
+        & (ages != inputs.payout_age)
+        & ~(in_house_loan & (house_pmt != 0 or inputs.oa_bal < 0))
+        & ~schedule.has_event()
+    )
+    runs = [0] * (len(ages) + 1)
+    for t in range(len(ages) - 1, -1, -1):
+        runs[t] = runs[t + 1] + 1 if quiet[t] else 0
+    return runs[:-1]
+
+
+def compound(balance: float, topup: float, rate: float, ks: np.ndarray) -> np.ndarray:
+    """
+    Balance after each of `ks` years of b -> (b + topup) * (1 + rate):
+    b * g^k + topup * g * (g^k - 1) / (g - 1), with g = 1 + rate.
+    """
+    g = 1 + rate
+    growth = g**ks
+    if rate == 0:
+        return balance + topup * ks
+    return balance * growth + topup * g * (growth - 1) / rate
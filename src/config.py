@@ -0,0 +1,311 @@
+# src/config.py
+import dataclasses
+import typing
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.defaults import get_singapore_default_inputs
+from src.events import EVENT_ACCOUNTS, EVENT_KINDS, events_from_records
+from src.models import SimulationInputs
+
+# (min, max) of every sidebar widget, in sidebar units: rates are percent
+SIDEBAR_LIMITS = {
+    "current_age": (20, 80),
+    "retire_age": (30, 80),
+    "life_expectancy": (70, 110),
+    "inflation_rate": (0.0, 15.0),
+    "spend_bridge": (0, 50000),
+    "spend_unlock": (0, 50000),
+    "spend_late": (0, 50000),
+    "ra_target": (0, 1000000),
+    "payout_age": (65, 70),
+    "cash_inv": (0, 10000000),
+    "cash_apy": (0.0, 20.0),
+    "cash_topup": (0, 50000),
+    "oa_bal": (0, 5000000),
+    "oa_inv": (0, 5000000),
+    "oa_apy": (0.0, 20.0),
+    "oa_topup": (0, 50000),
+    "sa_bal": (0, 5000000),
+    "sa_inv": (0, 5000000),
+    "sa_apy": (0.0, 20.0),
+    "sa_topup": (0, 50000),
+    "house_loan_amt": (0, 5000000),
+    "house_start_age": (20, 70),
+    "house_tenure": (1, 40),
+    "house_rate": (0.0, 10.0),
+    "house_downpayment": (0, 1000000),
+    "car_loan_amt": (0, 500000),
+    "car_start_age": (20, 70),
+    "car_tenure": (1, 10),
+    "car_rate": (0.0, 10.0),
+    "car_downpayment": (0, 200000),
+}
+EVENT_AGE_LIMITS = (20, 110)
+
+# Entered as percent in the sidebar and saved configs, fractions in the engine
+PERCENT_FIELDS = {
+    "inflation_rate",
+    "cash_apy",
+    "oa_apy",
+    "sa_apy",
+    "house_rate",
+    "car_rate",
+}
+
+ERROR_COLUMNS = ["Config", "Field", "Value", "Error"]
+
+# Old config key -> current key
+LEGACY_FIELDS = {"frs_target": "ra_target"}
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    name: str
+    kind: type  # int or float, from the SimulationInputs annotation
+    lo: float
+    hi: float
+    default: float
+    percent: bool
+
+
+def _compile_schema() -> dict:
+    hints = typing.get_type_hints(SimulationInputs)
+    defaults = get_singapore_default_inputs()
+    schema = {}
+    for f in dataclasses.fields(SimulationInputs):
+        if f.name == "events":
+            continue  # ragged, checked separately
+        lo, hi = SIDEBAR_LIMITS[f.name]
+        schema[f.name] = FieldSpec(
+            f.name,
+            hints[f.name],
+            lo,
+            hi,
+            defaults[f.name],
+            f.name in PERCENT_FIELDS,
+        )
+    return schema
+
+
+SCHEMA = _compile_schema()
+
+
+class ConfigValidationError(ValueError):
+    """Raised by load_config; `errors` is the per-field report."""
+
+    def __init__(self, errors: pd.DataFrame):
+        self.errors = errors
+        lines = [
+            f"{row.Field}: {row.Error} (got {row.Value!r})"
+            for row in errors.itertuples()
+        ]
+        super().__init__("Invalid config:\n" + "\n".join(lines))
+
+
+@dataclass
+class ConfigBatch:
+    # One SimulationInputs per accepted config, in input order
+    inputs: list
+    # Positions of the accepted configs in the submitted sequence
+    accepted: np.ndarray
+    # One row per problem: Config (position), Field, Value, Error
+    errors: pd.DataFrame
+    # Validated values in sidebar units, (n_configs,) arrays per field
+    settings: dict
+    events: list
+
+
+def migrate(config: dict) -> dict:
+    """Copy of `config` with legacy keys renamed (the current key wins)."""
+    migrated = dict(config)
+    for old, new in LEGACY_FIELDS.items():
+        if old in migrated:
+            value = migrated.pop(old)
+            migrated.setdefault(new, value)
+    return migrated
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float, np.number)) and not isinstance(
+        value, (bool, np.bool_)
+    )
+
+
+def _event_errors(events) -> list:
+    """(field, value, error) for every problem in one config's event list."""
+    if not isinstance(events, list):
+        return [("events", events, "must be a list of events")]
+    problems = []
+    age_lo, age_hi = EVENT_AGE_LIMITS
+    for i, event in enumerate(events):
+        where = f"events[{i}]"
+        if not isinstance(event, dict):
+            problems.append((where, event, "must be an object"))
+            continue
+        if event.get("kind") not in EVENT_KINDS:
+            problems.append(
+                (f"{where}.kind", event.get("kind"), f"must be one of {EVENT_KINDS}")
+            )
+        # Missing or blank means cash, as in events_from_records
+        if (event.get("account") or "cash") not in EVENT_ACCOUNTS:
+            problems.append(
+                (
+                    f"{where}.account",
+                    event.get("account"),
+                    f"must be one of {EVENT_ACCOUNTS}",
+                )
+            )
+        # Money events move a positive amount; spend changes go either way
+        amount = event.get("amount")
+        if event.get("kind") == "spend_change":
+            if not _is_number(amount) or amount != amount:
+                problems.append((f"{where}.amount", amount, "must be a number"))
+        elif not _is_number(amount) or not amount >= 0:
+            problems.append((f"{where}.amount", amount, "must be a number >= 0"))
+        for key, required in (("start_age", True), ("end_age", False)):
+            age = event.get(key)
+            if age is None and not required:
+                continue
+            whole = _is_number(age) and float(age).is_integer()
+            if not whole or not age_lo <= age <= age_hi:
+                problems.append(
+                    (
+                        f"{where}.{key}",
+                        age,
+                        f"must be a whole number between {age_lo} and {age_hi}",
+                    )
+                )
+        start, end = event.get("start_age"), event.get("end_age")
+        if _is_number(start) and _is_number(end) and end < start:
+            problems.append((f"{where}.end_age", end, "must not be before start_age"))
+    return problems
+
+
+def validate_configs(configs: Sequence[dict]) -> ConfigBatch:
+    """
+    Migrates and validates a batch of saved configs (sidebar units, as written
+    by the Download Settings button) and converts the valid ones to
+    SimulationInputs.
+
+    Scalar fields are checked column-wise over the whole batch, so cost is a
+    handful of array operations per field rather than per config. Missing
+    fields take the typical SG defaults, as they would in the sidebar.
+    Unknown fields, wrong types, fractional ages and out-of-range values are
+    rejected with one error row per problem.
+    """
+    n = len(configs)
+    if n == 0:
+        return ConfigBatch(
+            inputs=[],
+            accepted=np.zeros(0, dtype=np.int64),
+            errors=pd.DataFrame(columns=ERROR_COLUMNS),
+            settings={name: np.zeros(0) for name in SCHEMA},
+            events=[],
+        )
+    records = [migrate(c) if isinstance(c, dict) else {} for c in configs]
+    frame = pd.DataFrame.from_records(records, index=range(n))
+    rejected = np.zeros(n, dtype=bool)
+    errors = []
+
+    def reject(mask, field, values, message):
+        idx = np.flatnonzero(mask)
+        if len(idx):
+            rejected[idx] = True
+            values = pd.Series(values, dtype=object).iloc[idx].to_numpy()
+            errors.append(
+                pd.DataFrame(
+                    {"Config": idx, "Field": field, "Value": values, "Error": message}
+                )
+            )
+
+    not_dict = np.array([not isinstance(c, dict) for c in configs], dtype=bool)
+    reject(not_dict, "", list(configs), "config must be a JSON object")
+
+    for column in frame.columns:
+        if column not in SCHEMA and column != "events":
+            present = frame[column].notna().to_numpy()
+            reject(present, column, frame[column], "unknown field")
+
+    settings = {}
+    for spec in SCHEMA.values():
+        if spec.name not in frame:
+            settings[spec.name] = np.full(n, spec.default, dtype=float)
+            continue
+        raw = frame[spec.name]
+        missing = raw.isna().to_numpy()
+        if raw.dtype == object or raw.dtype == bool:
+            numeric = raw.map(_is_number).to_numpy(dtype=bool)
+            reject(~numeric & ~missing, spec.name, raw, "must be a number")
+            values = pd.to_numeric(raw.where(numeric), errors="coerce")
+        else:
+            values = raw
+        values = values.to_numpy(dtype=float, na_value=np.nan)
+        present = ~np.isnan(values)
+
+        if spec.kind is int:
+            fractional = present & (values != np.floor(values))
+            reject(fractional, spec.name, raw, "must be a whole number")
+        out_of_range = present & ((values < spec.lo) | (values > spec.hi))
+        reject(
+            out_of_range,
+            spec.name,
+            raw,
+            f"must be between {spec.lo} and {spec.hi}",
+        )
+        settings[spec.name] = np.where(present, values, spec.default)
+
+    # Event lists are ragged, so they are checked per config
+    events = [record.get("events") or [] for record in records]
+    event_errors = [
+        (i, field, value, message)
+        for i, config_events in enumerate(events)
+        for field, value, message in _event_errors(config_events)
+    ]
+    if event_errors:
+        rejected[[row[0] for row in event_errors]] = True
+        errors.append(pd.DataFrame(event_errors, columns=ERROR_COLUMNS))
+
+    accepted = np.flatnonzero(~rejected)
+    columns = []
+    for spec in SCHEMA.values():
+        values = settings[spec.name][accepted]
+        if spec.percent:
+            values = values / 100.0
+        columns.append(values.astype(spec.kind).tolist())
+    # SCHEMA follows the SimulationInputs field order, with events last
+    inputs = [
+        SimulationInputs(*row, events_from_records(events[i]) if events[i] else [])
+        for i, row in zip(accepted.tolist(), zip(*columns))
+    ]
+
+    error_frame = (
+        pd.concat(errors, ignore_index=True).sort_values("Config", kind="stable")
+        if errors
+        else pd.DataFrame(columns=ERROR_COLUMNS)
+    )
+    return ConfigBatch(
+        inputs=inputs,
+        accepted=accepted,
+        errors=error_frame.reset_index(drop=True),
+        settings=settings,
+        events=events,
+    )
+
+
+def load_config(config: dict) -> dict:
+    """
+    Validated, migrated sidebar settings for one config, with every field
+    present; raises ConfigValidationError listing each bad field.
+    """
+    batch = validate_configs([config])
+    if len(batch.errors):
+        raise ConfigValidationError(batch.errors)
+    settings = {
+        name: spec.kind(batch.settings[name][0]) for name, spec in SCHEMA.items()
+    }
+    settings["events"] = batch.events[0]
+    return settings
@@ -3,3 +3,10 @@
 SA_BASE_RATE = 0.04
 OA_BASE_RATE = 0.025
 # Standard Life Plan payouts or other fixed assumptions could go here
+
+# Order of the factor axis in scenario cubes (matches RatePaths fields)
+SCENARIO_FACTORS = ("cash_apy", "oa_apy", "sa_apy", "inflation_rate")
+
+# Stamped into exported results; bump when engine output columns or their
+# meaning change so downstream readers can tell runs apart
+ENGINE_VERSION = "1.0"
@@ -39,4 +39,7 @@ def get_singapore_default_inputs() -> dict:
         "car_downpayment": 0.0,
         "car_tenure": 7,
         "car_rate": 2.78,
+        # Life events (see LifeEvent); e.g. {"kind": "windfall", "amount":
+        # 50000, "start_age": 45, "end_age": None, "account": "cash", "label": ""}
+        "events": [],
     }
@@ -1,12 +1,71 @@
 # src/engine.py
+import numpy as np
 import pandas as pd
-import numpy_financial as npf
-from src.models import SimulationInputs
+from src.models import SimulationInputs, SimulationSummary
 from src.constants import SA_BASE_RATE, OA_BASE_RATE
+from src.closed_form import compound, quiet_runs
+from src.events import build_schedule, house_payment
 
-def run_simulation(inputs: SimulationInputs) -> pd.DataFrame:
-    ages = list(range(inputs.current_age, inputs.life_expectancy + 1))
-    data = []
+
+# Columns the year loop fills; Net_Worth and the *_Real columns are derived
+# from them in one vectorized pass (_to_frame)
+_LOOP_COLUMNS = [
+    "Age",
+    "Liquid_Cash_Balance",
+    "OA_Total",
+    "SA_Total",
+    "FRS_RA",
+    "Accessible_Liquidity",
+    "Phase_Target",
+    "CPF_Life_Payout_Annual",
+    "Deflator",
+]
+_REAL_COLUMNS = [
+    "Liquid_Cash_Balance",
+    "OA_Total",
+    "SA_Total",
+    "FRS_RA",
+    "Net_Worth",
+    "Accessible_Liquidity",
+    "CPF_Life_Payout_Annual",
+]
+_FRAME_COLUMNS = (
+    _LOOP_COLUMNS[:5]
+    + ["Net_Worth"]
+    + _LOOP_COLUMNS[5:8]
+    + [f"{name}_Real" for name in _REAL_COLUMNS]
+)
+
+
+def _to_frame(rows: dict) -> pd.DataFrame:
+    if not rows["Age"]:
+        return pd.DataFrame()
+    columns = {name: np.asarray(values) for name, values in rows.items()}
+    deflators = columns.pop("Deflator")
+    columns["Net_Worth"] = (
+        columns["Liquid_Cash_Balance"]
+        + columns["OA_Total"]
+        + columns["SA_Total"]
+        + columns["FRS_RA"]
+    )
+    # Same balances deflated to today's dollars
+    for name in _REAL_COLUMNS:
+        columns[f"{name}_Real"] = columns[name] / deflators
+    return pd.DataFrame({name: columns[name] for name in _FRAME_COLUMNS})
+
+
+def run_simulation_with_summary(
+    inputs: SimulationInputs, closed_form: bool = False
+) -> tuple[pd.DataFrame, SimulationSummary]:
+    """
+    Steps through every year from current_age to life_expectancy.
+
+    With `closed_form`, runs of event-free working years are evaluated
+    analytically instead of one loop iteration at a time; results match the
+    plain loop up to floating-point rounding. For a single path the loop is
+    already as fast, so it is off by default; run_batch is where it pays.
+    """
+    rows = {name: [] for name in _LOOP_COLUMNS}
 
     # Initialize State
     curr_sa = inputs.sa_bal
@@ -18,25 +77,55 @@ def run_simulation(inputs: SimulationInputs) -> pd.DataFrame:
     frs_locked = False
     frs_balance = 0.0
     cpf_life_annual_payout = 0.0
+    summary = SimulationSummary()
+
+    # Loan Calculator and pre-aggregated life events (incl. car loan, downpayments)
+    house_pmt = house_payment(inputs)
+    schedule = build_schedule(inputs)
+    cash_events = schedule.cash.tolist()
+    oa_events = schedule.oa.tolist()
+    sa_events = schedule.sa.tolist()
+    spend_events = schedule.spend.tolist()
+    runs = quiet_runs(inputs, house_pmt, schedule)
+
+    age = inputs.current_age
+    while age <= inputs.life_expectancy:
+        # Closed-form jump across event-free working years
+        t = age - inputs.current_age
+        span = runs[t] if closed_form else 0
+        if span > 1:
+            ks = np.arange(1, span + 1)
+            cash = compound(curr_cash, inputs.cash_topup * 12, inputs.cash_apy, ks)
+            oa_inv = compound(curr_oa_inv, inputs.oa_topup * 12, inputs.oa_apy, ks)
+            sa_inv = compound(curr_sa_inv, inputs.sa_topup * 12, inputs.sa_apy, ks)
+            oa = compound(curr_oa, 0.0, OA_BASE_RATE, ks)
+            sa = compound(curr_sa, 0.0, SA_BASE_RATE, ks)
+
+            span_ages = age + ks - 1
+            years = span_ages - inputs.current_age
+            cash_bals = np.maximum(0, cash).tolist()
+            rows["Age"].extend(span_ages.tolist())
+            rows["Liquid_Cash_Balance"].extend(cash_bals)
+            rows["OA_Total"].extend((oa + oa_inv).tolist())
+            rows["SA_Total"].extend((sa + sa_inv).tolist())
+            rows["FRS_RA"].extend([frs_balance] * span)
+            rows["Accessible_Liquidity"].extend(cash_bals)
+            rows["Phase_Target"].extend([inputs.spend_bridge] * span)
+            rows["CPF_Life_Payout_Annual"].extend([cpf_life_annual_payout] * span)
+            rows["Deflator"].extend(((1 + inputs.inflation_rate) ** years).tolist())
+            # Quiet years are pre-55 working years: only the bridge KPI lands here
+            if age <= 54 < age + span:
+                summary.bridge_cash_left = cash_bals[54 - age]
+                summary.bridge_safe = summary.bridge_cash_left > 0
+
+            curr_cash = float(cash[-1])
+            curr_oa_inv = float(oa_inv[-1])
+            curr_sa_inv = float(sa_inv[-1])
+            curr_oa = float(oa[-1])
+            curr_sa = float(sa[-1])
+            age += span
+            continue
 
-    # Loan Calculators
-    house_pmt = 0
-    if inputs.house_loan_amt > 0:
-        house_pmt = (
-            -npf.pmt(
-                inputs.house_rate / 12, inputs.house_tenure * 12, inputs.house_loan_amt
-            )
-            * 12
-        )
-
-    car_pmt = 0
-    if inputs.car_loan_amt > 0:
-        car_pmt = (
-            inputs.car_loan_amt
-            + (inputs.car_loan_amt * inputs.car_rate * inputs.car_tenure)
-        ) / inputs.car_tenure
-
-    for age in ages:
         is_retired = age >= inputs.retire_age
 
         # 0. Spending Targets
@@ -46,6 +135,8 @@ def run_simulation(inputs: SimulationInputs) -> pd.DataFrame:
             target_spend_today = inputs.spend_unlock
         else:
             target_spend_today = inputs.spend_late
+        if spend_events[t]:
+            target_spend_today = max(0, target_spend_today + spend_events[t])
 
         deflator = (1 + inputs.inflation_rate) ** (age - inputs.current_age)
         annual_spend_nominal = target_spend_today * 12 * deflator
@@ -100,9 +191,12 @@ def run_simulation(inputs: SimulationInputs) -> pd.DataFrame:
                     
                     spend_needed -= take
 
-        # 4. Liabilities (CPF Usage is allowed for Housing before 55)
-        if age == inputs.house_start_age:
-            curr_cash -= inputs.house_downpayment
+        # 4. Life events (windfalls, expenses, top-ups, car loan, downpayments)
+        curr_cash += cash_events[t]
+        curr_oa_inv += oa_events[t]
+        curr_sa_inv += sa_events[t]
+
+        # Mortgage (CPF Usage is allowed for Housing before 55)
         if (
             inputs.house_start_age
             <= age
@@ -120,11 +214,6 @@ def run_simulation(inputs: SimulationInputs) -> pd.DataFrame:
                 curr_oa_inv = 0
                 curr_cash -= remaining
 
-        if age == inputs.car_start_age:
-            curr_cash -= inputs.car_downpayment
-        if inputs.car_start_age <= age < (inputs.car_start_age + inputs.car_tenure):
-            curr_cash -= car_pmt
-
         # 5. RA Logic: Transfer at 55
         if age == 55 and not frs_locked:
             needed = inputs.ra_target
@@ -153,15 +242,52 @@ def run_simulation(inputs: SimulationInputs) -> pd.DataFrame:
             cpf_life_annual_payout = frs_balance * base_payout_rate * deferral_bonus
             frs_balance = 0.0
 
-        data.append({
-            "Age": age,
-            "Liquid_Cash_Balance": max(0, curr_cash),
-            "OA_Total": curr_oa + curr_oa_inv,
-            "SA_Total": curr_sa + curr_sa_inv,
-            "FRS_RA": frs_balance,
-            "Net_Worth": max(0, curr_cash) + curr_oa + curr_oa_inv + curr_sa + curr_sa_inv + frs_balance,
-            "Phase_Target": target_spend_today,
-            "CPF_Life_Payout_Annual": cpf_life_annual_payout,
-        })
-
-    return pd.DataFrame(data)
+        cash_bal = max(0, curr_cash)
+        oa_total = curr_oa + curr_oa_inv
+        sa_total = curr_sa + curr_sa_inv
+        net_worth = cash_bal + oa_total + sa_total + frs_balance
+        accessible = cash_bal if age < 55 else cash_bal + oa_total + sa_total
+
+        # 6. KPIs (collected in-loop so callers never rescan the frame)
+        if age == inputs.retire_age:
+            summary.net_worth_at_retire = net_worth
+            summary.bridge_cash_start = cash_bal
+        if age == 54:
+            summary.bridge_cash_left = cash_bal
+            summary.bridge_safe = bool(cash_bal > 0)
+        if age == 55:
+            summary.cpf_surplus_at_55 = oa_total + sa_total
+        if age == inputs.payout_age:
+            summary.cpf_life_monthly_nominal = cpf_life_annual_payout / 12
+            summary.cpf_life_monthly_real = cpf_life_annual_payout / 12 / deflator
+        if is_retired:
+            if (
+                summary.min_accessible_liquidity is None
+                or accessible < summary.min_accessible_liquidity
+            ):
+                summary.min_accessible_liquidity = accessible
+            if accessible <= 0 and summary.depletion_age is None:
+                summary.depletion_age = age
+
+        for name, value in zip(
+            _LOOP_COLUMNS,
+            (
+                age,
+                cash_bal,
+                oa_total,
+                sa_total,
+                frs_balance,
+                accessible,
+                target_spend_today,
+                cpf_life_annual_payout,
+                deflator,
+            ),
+        ):
+            rows[name].append(value)
+        age += 1
+
+    return _to_frame(rows), summary
+
+
+def run_simulation(inputs: SimulationInputs, closed_form: bool = False) -> pd.DataFrame:
+    return run_simulation_with_summary(inputs, closed_form)[0]
@@ -0,0 +1,121 @@
+# src/events.py
+from dataclasses import dataclass
+
+import numpy as np
+import numpy_financial as npf
+
+from src.models import LifeEvent, SimulationInputs
+
+EVENT_KINDS = ("windfall", "expense", "topup", "spend_change")
+EVENT_ACCOUNTS = ("cash", "oa", "sa")
+EVENT_FIELDS = ["kind", "amount", "start_age", "end_age", "account", "label"]
+
+
+def _missing(value) -> bool:
+    return value is None or value != value  # None or NaN
+
+
+@dataclass
+class EventSchedule:
+    # Dense per-year deltas, index 0 = current_age. Money is nominal $ added
+    # at the end of the year; spend is monthly $ today added to the target.
+    cash: np.ndarray
+    oa: np.ndarray
+    sa: np.ndarray
+    spend: np.ndarray
+
+    def has_event(self) -> np.ndarray:
+        return (self.cash != 0) | (self.oa != 0) | (self.sa != 0) | (self.spend != 0)
+
+
+def house_payment(inputs: SimulationInputs) -> float:
+    """Annual mortgage payment (monthly amortisation x 12)."""
+    if inputs.house_loan_amt <= 0:
+        return 0
+    return (
+        -npf.pmt(
+            inputs.house_rate / 12, inputs.house_tenure * 12, inputs.house_loan_amt
+        )
+        * 12
+    )
+
+
+def loan_events(inputs: SimulationInputs) -> list:
+    """
+    The fixed liability fields expressed as cash events. The mortgage itself
+    stays in the engine because it is paid OA-first, not from cash.
+    """
+    events = []
+    if inputs.house_downpayment:
+        events.append(
+            LifeEvent("expense", inputs.house_downpayment, inputs.house_start_age)
+        )
+    if inputs.car_downpayment:
+        events.append(
+            LifeEvent("expense", inputs.car_downpayment, inputs.car_start_age)
+        )
+    if inputs.car_loan_amt > 0:
+        car_pmt = (
+            inputs.car_loan_amt
+            + (inputs.car_loan_amt * inputs.car_rate * inputs.car_tenure)
+        ) / inputs.car_tenure
+        events.append(
+            LifeEvent(
+                "expense",
+                car_pmt,
+                inputs.car_start_age,
+                inputs.car_start_age + inputs.car_tenure - 1,
+            )
+        )
+    return events
+
+
+def build_schedule(inputs: SimulationInputs) -> EventSchedule:
+    """
+    Pre-aggregates the loan events and inputs.events into per-year arrays,
+    once per run, so the year loop applies one add per account regardless of
+    how many events there are.
+    """
+    n_years = max(inputs.life_expectancy - inputs.current_age + 1, 0)
+    dense = {name: np.zeros(n_years) for name in ("cash", "oa", "sa", "spend")}
+
+    for event in loan_events(inputs) + list(inputs.events):
+        if event.kind == "spend_change":
+            target, amount = "spend", event.amount
+            end_age = event.end_age
+            if end_age is None:
+                end_age = inputs.life_expectancy
+        else:
+            target = event.account
+            sign = -1 if event.kind == "expense" else 1
+            scale = 12 if event.kind == "topup" else 1
+            amount = sign * scale * event.amount
+            end_age = event.start_age if event.end_age is None else event.end_age
+
+        start = max(event.start_age - inputs.current_age, 0)
+        stop = min(end_age - inputs.current_age + 1, n_years)
+        if start < stop:
+            dense[target][start:stop] += amount
+
+    return EventSchedule(**dense)
+
+
+def events_from_records(records: list) -> list:
+    """LifeEvents from JSON / data-editor rows; blank rows are skipped."""
+    events = []
+    for record in records:
+        if not record.get("kind") or _missing(record.get("start_age")):
+            continue
+        amount = record.get("amount")
+        end_age = record.get("end_age")
+        events.append(
+            LifeEvent(
+                kind=record["kind"],
+                amount=0.0 if _missing(amount) else float(amount),
+                start_age=int(record["start_age"]),
+                end_age=None if _missing(end_age) else int(end_age),
+                account=record.get("account") or "cash",
+                label=record.get("label") or "",
+            )
+        )
+    return events
@@ -0,0 +1,213 @@
+# src/export.py
+import json
+from dataclasses import asdict
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.batch import BatchResult
+from src.constants import ENGINE_VERSION
+from src.models import SimulationInputs, SimulationSummary
+
+FORMATS = ("feather", "parquet")
+_SUFFIXES = {
+    ".feather": "feather",
+    ".arrow": "feather",
+    ".ipc": "feather",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+}
+VERSION_KEY = b"fire.engine_version"
+INPUTS_KEY = b"fire.inputs"
+SUMMARY_KEY = b"fire.summary"
+
+# Per-path BatchResult KPIs exported as batch columns, repeated on each of a
+# path's rows (Parquet stores the repeats as runs)
+PATH_COLUMNS = {
+    "depletion_age": "Depletion_Age",
+    "min_accessible_liquidity": "Min_Accessible_Liquidity",
+    "net_worth_at_retire": "Net_Worth_At_Retire",
+    "bridge_cash_start": "Bridge_Cash_Start",
+    "bridge_cash_left": "Bridge_Cash_Left",
+    "cpf_surplus_at_55": "CPF_Surplus_At_55",
+    "cpf_life_monthly_nominal": "CPF_Life_Monthly_Nominal",
+    "cpf_life_monthly_real": "CPF_Life_Monthly_Real",
+}
+
+
+def _metadata(
+    inputs: Optional[SimulationInputs], summary: Optional[SimulationSummary] = None
+) -> dict:
+    metadata = {VERSION_KEY: ENGINE_VERSION.encode()}
+    if inputs is not None:
+        metadata[INPUTS_KEY] = json.dumps(asdict(inputs)).encode()
+    if summary is not None:
+        metadata[SUMMARY_KEY] = json.dumps(asdict(summary)).encode()
+    return metadata
+
+
+def _resolve_format(path, format: Optional[str]) -> str:
+    if format is None:
+        format = _SUFFIXES.get(Path(path).suffix.lower())
+    if format not in FORMATS:
+        raise ValueError(f"Unknown export format for {path!r}; use one of {FORMATS}")
+    return format
+
+
+def _open_writer(sink, schema: pa.Schema, format: str):
+    if format == "parquet":
+        return pq.ParquetWriter(sink, schema)
+    # Feather v2 is the Arrow IPC file format. Left uncompressed so readers
+    # can memory-map it without decoding.
+    return pa.ipc.new_file(sink, schema)
+
+
+# --- SINGLE RUNS ---
+def results_table(
+    df: pd.DataFrame,
+    inputs: Optional[SimulationInputs] = None,
+    summary: Optional[SimulationSummary] = None,
+) -> pa.Table:
+    """
+    run_simulation output as an Arrow table stamped with the engine version
+    and (optionally) the inputs that produced it and its SimulationSummary.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = {**(table.schema.metadata or {}), **_metadata(inputs, summary)}
+    return table.replace_schema_metadata(metadata)
+
+
+def write_results(
+    df: pd.DataFrame,
+    path,
+    inputs: Optional[SimulationInputs] = None,
+    format: Optional[str] = None,
+    summary: Optional[SimulationSummary] = None,
+):
+    """Writes one run to Feather or Parquet (inferred from the suffix)."""
+    table = results_table(df, inputs, summary)
+    with _open_writer(str(path), table.schema, _resolve_format(path, format)) as w:
+        w.write_table(table)
+
+
+def results_bytes(
+    df: pd.DataFrame,
+    inputs: Optional[SimulationInputs] = None,
+    format="parquet",
+    summary: Optional[SimulationSummary] = None,
+) -> bytes:
+    """In-memory write_results, for download buttons."""
+    table = results_table(df, inputs, summary)
+    sink = pa.BufferOutputStream()
+    with _open_writer(sink, table.schema, _resolve_format("", format)) as w:
+        w.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+# --- BATCHES ---
+def batch_schema(
+    result: BatchResult, inputs: Optional[SimulationInputs] = None
+) -> pa.Schema:
+    """
+    Long layout: one row per (Path, Age), one column per engine output,
+    keeping the batch dtype (float32 batches stay float32), then the
+    path's KPIs (PATH_COLUMNS) as float64.
+    """
+    fields = [pa.field("Path", pa.int64()), pa.field("Age", pa.int64())]
+    fields += [
+        pa.field(name, pa.from_numpy_dtype(values.dtype))
+        for name, values in result.columns.items()
+    ]
+    fields += [pa.field(name, pa.float64()) for name in PATH_COLUMNS.values()]
+    return pa.schema(fields, metadata=_metadata(inputs))
+
+
+def batch_record_batches(
+    result: BatchResult,
+    schema: pa.Schema,
+    first_path: int = 0,
+    chunk_paths: int = 10_000,
+) -> Iterator[pa.RecordBatch]:
+    """
+    Yields `chunk_paths` paths at a time as Arrow record batches. The output
+    arrays are C-ordered (paths, years), so each column slice flattens to
+    a view that Arrow wraps without copying.
+    """
+    n_paths, n_years = len(result.depletion_age), len(result.ages)
+    for start in range(0, n_paths, chunk_paths):
+        stop = min(start + chunk_paths, n_paths)
+        paths = np.arange(first_path + start, first_path + stop, dtype=np.int64)
+        arrays = [
+            pa.array(np.repeat(paths, n_years)),
+            pa.array(np.tile(result.ages.astype(np.int64), stop - start)),
+        ]
+        arrays += [
+            pa.array(np.ascontiguousarray(values[start:stop]).reshape(-1))
+            for values in result.columns.values()
+        ]
+        arrays += [
+            pa.array(np.repeat(getattr(result, field)[start:stop], n_years))
+            for field in PATH_COLUMNS
+        ]
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def write_batch_results(
+    results: Union[BatchResult, Iterable[BatchResult]],
+    path,
+    inputs: Optional[SimulationInputs] = None,
+    format: Optional[str] = None,
+    chunk_paths: int = 10_000,
+):
+    """
+    Streams one BatchResult, or consecutive chunks of one run (e.g. run_batch
+    per slice of a scenario cube), to Feather or Parquet as record batches.
+    No pandas frame is built and only one chunk is held at a time; paths are
+    numbered across chunks in order.
+    """
+    if isinstance(results, BatchResult):
+        results = [results]
+    format = _resolve_format(path, format)
+
+    writer = schema = None
+    first_path = 0
+    try:
+        for result in results:
+            if writer is None:
+                schema = batch_schema(result, inputs)
+                writer = _open_writer(str(path), schema, format)
+            for batch in batch_record_batches(result, schema, first_path, chunk_paths):
+                writer.write_batch(batch)
+            first_path += len(result.depletion_age)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+# --- READING ---
+def read_results(path) -> pa.Table:
+    """Reads an export back; Feather files are memory-mapped, not copied."""
+    if _resolve_format(path, None) == "parquet":
+        return pq.read_table(str(path))
+    # The table's buffers keep the mapping alive, so it is not closed here
+    return pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+
+
+def export_info(table: pa.Table) -> tuple:
+    """(engine_version, inputs dict or None) stamped on an exported table."""
+    metadata = table.schema.metadata or {}
+    inputs = metadata.get(INPUTS_KEY)
+    return (
+        metadata.get(VERSION_KEY, b"").decode() or None,
+        None if inputs is None else json.loads(inputs),
+    )
+
+
+def export_summary(table: pa.Table) -> Optional[dict]:
+    """The SimulationSummary stamped on a single-run export, if any."""
+    summary = (table.schema.metadata or {}).get(SUMMARY_KEY)
+    return None if summary is None else json.loads(summary)
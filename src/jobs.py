@@ -0,0 +1,141 @@
+# src/jobs.py
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, is_dataclass
+from typing import Callable, Optional
+
+from src.parallel import SimulationCancelled
+
+
+def fingerprint(*parts) -> str:
+    """Stable key for a job's arguments; dataclasses are compared by value."""
+    payload = json.dumps(
+        [asdict(p) if is_dataclass(p) else p for p in parts],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+@dataclass
+class Job:
+    key: str
+    cancel: threading.Event = field(default_factory=threading.Event)
+    future: Optional[Future] = None
+    started: float = field(default_factory=time.monotonic)
+    finished: Optional[float] = None
+    # Last progress(done, total) report from the task
+    done: int = 0
+    total: int = 0
+
+    def report(self, done: int, total: int):
+        self.done, self.total = done, total
+
+    @property
+    def fraction(self) -> float:
+        return self.done / self.total if self.total else 0.0
+
+    def _finish(self, _future: Future):
+        self.finished = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        end = time.monotonic() if self.finished is None else self.finished
+        return end - self.started
+
+    @property
+    def status(self) -> str:
+        """One of running, cancelling, cancelled, failed, done."""
+        if not self.future.done():
+            return "cancelling" if self.cancel.is_set() else "running"
+        if self.future.cancelled():
+            return "cancelled"
+        error = self.future.exception()
+        if isinstance(error, SimulationCancelled):
+            return "cancelled"
+        return "failed" if error is not None else "done"
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("running", "cancelling")
+
+
+class JobManager:
+    """
+    Runs heavy tasks on a background thread pool, one job per slot. A slot is
+    any hashable key, e.g. (session id, "monte_carlo") when one manager is
+    shared by every session of the app.
+
+    `fn` must accept `progress` and `cancel` keywords, as run_monte_carlo and
+    run_sweep do. Submitting the key a slot already holds returns that job,
+    even if it failed (it is only rerun once cancelled);
+    a new key supersedes it: the old job is cancelled (it stops at its next
+    shard boundary) and the new one queues behind it.
+    """
+
+    def __init__(self, max_workers: int = 1):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="fire-job"
+        )
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+
+    def submit(self, slot, key: str, fn: Callable, *args, **kwargs) -> Job:
+        with self._lock:
+            current = self._jobs.get(slot)
+            if current is not None and current.key == key:
+                if current.status != "cancelled":
+                    return current
+            if current is not None:
+                self._stop(current)
+
+            job = Job(key)
+            job.future = self._executor.submit(
+                fn, *args, progress=job.report, cancel=job.cancel, **kwargs
+            )
+            job.future.add_done_callback(job._finish)
+            self._jobs[slot] = job
+            return job
+
+    def get(self, slot) -> Optional[Job]:
+        return self._jobs.get(slot)
+
+    def cancel(self, slot):
+        with self._lock:
+            job = self._jobs.get(slot)
+            if job is not None:
+                self._stop(job)
+
+    def reap(self, keep: Callable[[object], bool]) -> int:
+        """Cancels and forgets every job whose slot fails `keep`."""
+        with self._lock:
+            gone = [slot for slot in self._jobs if not keep(slot)]
+            for slot in gone:
+                self._stop(self._jobs.pop(slot))
+        return len(gone)
+
+    def start_reaper(self, keep: Callable[[object], bool], interval: float = 5.0):
+        """Calls reap(keep) every `interval` seconds on a daemon thread."""
+
+        def loop():
+            while not self._closed.wait(interval):
+                self.reap(keep)
+
+        threading.Thread(target=loop, name="fire-job-reaper", daemon=True).start()
+
+    def shutdown(self):
+        self._closed.set()
+        with self._lock:
+            for job in self._jobs.values():
+                self._stop(job)
+            self._jobs.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _stop(job: Job):
+        job.cancel.set()
+        job.future.cancel()  # only succeeds if it has not started yet
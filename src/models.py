@@ -1,5 +1,22 @@
 # src/models.py
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class LifeEvent:
+    # "windfall" / "expense": lump sum (nominal $) added to / taken from
+    #     `account` at every age from start_age to end_age
+    # "topup": extra monthly contribution (nominal $) to `account`
+    # "spend_change": monthly change to target spending ($ today)
+    kind: str
+    amount: float
+    start_age: int
+    # Last age (inclusive). None means one-off for money events and
+    # "for the rest of the plan" for spend_change.
+    end_age: Optional[int] = None
+    account: str = "cash"  # "cash", "oa" or "sa" (invested portions)
+    label: str = ""
 
 
 @dataclass
@@ -46,3 +63,28 @@ class SimulationInputs:
     car_downpayment: float
     car_tenure: int
     car_rate: float
+
+    # One-off and recurring life events (see LifeEvent)
+    events: list = field(default_factory=list)
+
+
+@dataclass
+class SimulationSummary:
+    # Headline KPIs collected by the engine while it steps through the years.
+    # Fields are None when the relevant age falls outside the simulated horizon.
+    net_worth_at_retire: Optional[float] = None
+    bridge_cash_start: Optional[float] = None
+
+    # Bridge: cash (the only accessible source before 55) left at age 54
+    bridge_safe: Optional[bool] = None
+    bridge_cash_left: Optional[float] = None
+
+    # Retirement liquidity (cash before 55, cash + CPF surplus from 55)
+    depletion_age: Optional[int] = None
+    min_accessible_liquidity: Optional[float] = None
+
+    cpf_surplus_at_55: Optional[float] = None
+
+    # CPF LIFE monthly payout at payout_age, nominal and in today's dollars
+    cpf_life_monthly_nominal: Optional[float] = None
+    cpf_life_monthly_real: Optional[float] = None
@@ -0,0 +1,231 @@
+# src/montecarlo.py
+from dataclasses import dataclass
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from src.batch import RatePaths, run_batch
+from src.models import SimulationInputs
+from src.parallel import Shard, ShardedRunner, make_shards
+from src.scenarios import ScenarioModel, open_cube
+
+DEFAULT_QUANTILES = (0.05, 0.25, 0.50, 0.75, 0.95)
+
+
+@dataclass
+class MarketAssumptions:
+    # Annual volatility around the expected rates in SimulationInputs.
+    # Rates are drawn independently per year from a normal distribution.
+    cash_vol: float = 0.0
+    oa_vol: float = 0.10
+    sa_vol: float = 0.10
+    inflation_vol: float = 0.01
+
+
+def sample_rate_paths(
+    inputs: SimulationInputs,
+    assumptions: MarketAssumptions,
+    n_paths: int,
+    rng: np.random.Generator,
+) -> RatePaths:
+    shape = (n_paths, max(inputs.life_expectancy - inputs.current_age + 1, 0))
+    return RatePaths(
+        cash_apy=rng.normal(inputs.cash_apy, assumptions.cash_vol, shape),
+        oa_apy=rng.normal(inputs.oa_apy, assumptions.oa_vol, shape),
+        sa_apy=rng.normal(inputs.sa_apy, assumptions.sa_vol, shape),
+        inflation_rate=rng.normal(
+            inputs.inflation_rate, assumptions.inflation_vol, shape
+        ),
+    )
+
+
+class AgeHistogram:
+    """
+    Online per-age quantile estimator over fixed, log-spaced bins.
+
+    Memory is n_ages * (n_bins + 2) counters regardless of how many values
+    are added. Bins are geometric with ratio r = (hi / lo) ** (1 / n_bins);
+    values below `lo` (including zero and negatives) share an underflow bin,
+    values at or above `hi` share an overflow bin.
+
+    Error bound, against the exact inverted-CDF quantile x of the same data
+    (numpy method="inverted_cdf"):
+    - lo <= x < hi: |estimate - x| <= (sqrt(r) - 1) * x   (the bin's
+      geometric midpoint is returned);
+    - x < lo: estimate is 0.0, so |estimate - x| <= lo for non-negative x;
+    - x >= hi: estimate is `hi` (clamped); widen the range if this matters.
+    The defaults (lo=$100, hi=$10B, 2048 bins) give r ~ 1.009, i.e. a
+    relative error of at most ~0.45%.
+    """
+
+    def __init__(
+        self, n_ages: int, lo: float = 1e2, hi: float = 1e10, n_bins: int = 2048
+    ):
+        self.lo = lo
+        self.hi = hi
+        self.n_bins = n_bins
+        self.log_lo = np.log(lo)
+        self.log_ratio = (np.log(hi) - np.log(lo)) / n_bins
+        self.counts = np.zeros((n_ages, n_bins + 2), dtype=np.int64)
+
+    @property
+    def rel_error_bound(self) -> float:
+        return float(np.exp(self.log_ratio / 2) - 1)
+
+    @property
+    def total(self) -> int:
+        return int(self.counts[:1].sum())
+
+    def add(self, values: np.ndarray):
+        """Folds a (n_values, n_ages) block into the per-age counts."""
+        n_ages, width = self.counts.shape
+        with np.errstate(divide="ignore", invalid="ignore"):
+            idx = np.floor((np.log(values) - self.log_lo) / self.log_ratio) + 1
+        idx = np.where(values < self.lo, 0, idx)
+        idx = np.clip(idx, 0, width - 1).astype(np.int64)
+        flat = idx + np.arange(n_ages) * width
+        self.counts += np.bincount(flat.ravel(), minlength=n_ages * width).reshape(
+            n_ages, width
+        )
+
+    def merge(self, other: "AgeHistogram"):
+        self.counts += other.counts
+
+    def quantile(self, q: float) -> np.ndarray:
+        cum = np.cumsum(self.counts, axis=1)
+        rank = np.maximum(np.ceil(q * cum[:, -1]), 1)
+        k = np.argmax(cum >= rank[:, None], axis=1)
+        midpoint = np.exp(self.log_lo + (k - 0.5) * self.log_ratio)
+        return np.where(k == 0, 0.0, np.where(k > self.n_bins, self.hi, midpoint))
+
+
+@dataclass
+class MonteCarloResult:
+    # Age plus one column per percentile (P5 ... P95) and the share of paths
+    # not yet depleted at each age (Success_Rate)
+    percentiles: pd.DataFrame
+    success_rate: float
+    n_paths: int
+    metric: str
+    # Documented error of the percentile columns, see AgeHistogram
+    rel_error_bound: float
+    abs_error_floor: float
+
+
+def shard_rates(inputs: SimulationInputs, source, shard: Shard) -> RatePaths:
+    """
+    Rates for one shard of paths. `source` is a MarketAssumptions
+    (independent normal draws), a ScenarioModel (correlated / regime-switching
+    draws), or the path of a scenario cube written by write_cube, in which
+    case paths [shard.start:shard.stop] are read straight from the mapping.
+    """
+    n_years = max(inputs.life_expectancy - inputs.current_age + 1, 0)
+    if isinstance(source, MarketAssumptions):
+        rng = np.random.default_rng(shard.seed_seq)
+        return sample_rate_paths(inputs, source, shard.size, rng)
+    if isinstance(source, ScenarioModel):
+        rng = np.random.default_rng(shard.seed_seq)
+        return RatePaths.from_cube(source.sample(rng, shard.size, n_years), n_years)
+    cube = open_cube(source)
+    if shard.stop > len(cube):
+        raise ValueError(f"Scenario cube holds {len(cube)} paths, need {shard.stop}")
+    return RatePaths.from_cube(cube, n_years, shard.start, shard.stop)
+
+
+def simulate_chunk(
+    inputs: SimulationInputs,
+    rates: RatePaths,
+    histogram: AgeHistogram,
+    survivors: np.ndarray,
+    metric: str,
+):
+    """Runs one chunk of paths and folds it into `histogram` and `survivors`."""
+    result = run_batch(inputs, rates)
+    histogram.add(result.columns[metric])
+    depleted_by = result.depletion_age[:, None] <= result.ages[None, :]
+    survivors += rates.n_paths - depleted_by.sum(axis=0)
+
+
+def summarize(
+    ages: np.ndarray,
+    histogram: AgeHistogram,
+    survivors: np.ndarray,
+    metric: str,
+    quantiles=DEFAULT_QUANTILES,
+) -> MonteCarloResult:
+    n_paths = histogram.total
+    table = {"Age": ages}
+    for q in quantiles:
+        table[f"P{round(q * 100)}"] = histogram.quantile(q)
+    table["Success_Rate"] = survivors / n_paths
+    return MonteCarloResult(
+        percentiles=pd.DataFrame(table),
+        # NaN for an empty horizon (current_age past life_expectancy)
+        success_rate=float(survivors[-1] / n_paths) if len(ages) else np.nan,
+        n_paths=n_paths,
+        metric=metric,
+        rel_error_bound=histogram.rel_error_bound,
+        abs_error_floor=histogram.lo,
+    )
+
+
+def _monte_carlo_shard(
+    inputs: SimulationInputs,
+    source,
+    metric: str,
+    shard: Shard,
+    out: np.ndarray,
+):
+    # out[:, :-1] holds histogram counts, out[:, -1] the survivor counts
+    histogram = AgeHistogram(out.shape[0])
+    survivors = np.zeros(out.shape[0], dtype=np.int64)
+    simulate_chunk(
+        inputs, shard_rates(inputs, source, shard), histogram, survivors, metric
+    )
+    out[:, :-1] += histogram.counts
+    out[:, -1] += survivors
+
+
+def run_monte_carlo(
+    inputs: SimulationInputs,
+    source,
+    n_paths: int,
+    seed: int = 0,
+    chunk_size: int = 10_000,
+    metric: str = "Net_Worth_Real",
+    quantiles=DEFAULT_QUANTILES,
+    workers: int = 1,
+    progress=None,
+    cancel=None,
+) -> MonteCarloResult:
+    """
+    Streams `n_paths` random paths through the batch engine in fixed-size
+    chunks; `source` supplies the rates (see shard_rates). Only the per-age
+    histograms and survivor counts are kept, so peak memory depends on
+    `chunk_size` (times `workers`), not on `n_paths`.
+
+    Each chunk draws from its own stream derived from `seed`, and counts merge
+    by integer addition, so results are bit-identical for any `workers`.
+    `progress(done, total)` is called per finished chunk; setting the
+    `cancel` event raises SimulationCancelled.
+    """
+    ages = np.arange(inputs.current_age, inputs.life_expectancy + 1)
+    if len(ages) == 0:
+        return summarize(
+            ages, AgeHistogram(0), np.zeros(0, dtype=np.int64), metric, quantiles
+        )
+    width = AgeHistogram(len(ages)).counts.shape[1]
+
+    runner = ShardedRunner(max_workers=workers, progress=progress, cancel=cancel)
+    merged = runner.run(
+        partial(_monte_carlo_shard, inputs, source, metric),
+        make_shards(n_paths, chunk_size, seed),
+        shape=(len(ages), width + 1),
+        dtype=np.int64,
+        accumulate=True,
+    )
+
+    histogram = AgeHistogram(len(ages))
+    histogram.counts += merged[:, :-1]
+    return summarize(ages, histogram, merged[:, -1], metric, quantiles)
@@ -0,0 +1,129 @@
+# src/mortality.py
+import dataclasses
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.batch import RatePaths, run_batch
+from src.engine import run_simulation_with_summary
+from src.models import SimulationInputs
+
+LIFE_TABLE_PATH = Path(__file__).parent / "data" / "sg_life_table.csv"
+MAX_AGE = 110
+
+
+def load_life_table(sex: str = "unisex") -> np.ndarray:
+    """
+    One-year death probabilities qx indexed by age 0..MAX_AGE from the bundled
+    Singapore table. "unisex" averages the male and female columns.
+
+    The bundled table is a synthetic Gompertz-Makeham approximation fitted to
+    SingStat's headline life expectancies, not the published qx (see the
+    header of the CSV).
+    """
+    table = pd.read_csv(LIFE_TABLE_PATH, comment="#", index_col="age")
+    if sex == "unisex":
+        return ((table["qx_male"] + table["qx_female"]) / 2).to_numpy()
+    return table[f"qx_{sex}"].to_numpy()
+
+
+def death_probabilities(qx: np.ndarray, current_age: int) -> np.ndarray:
+    """
+    P(death during the year at each age current_age..MAX_AGE | alive at
+    current_age). Sums to 1 because the table closes at MAX_AGE.
+    """
+    q = qx[current_age:]
+    alive = np.concatenate([[1.0], np.cumprod(1 - q)[:-1]])
+    return alive * q
+
+
+@dataclass
+class LongevityOutcome:
+    # Probability of still being alive when accessible money runs out
+    ruin_probability: float
+    # Expected number of years lived with no accessible money
+    expected_years_depleted: float
+    # Net worth (today's dollars) at death, weighted by the life table
+    expected_bequest_real: float
+    # First retired age with no accessible liquidity on the max-horizon run
+    depletion_age: Optional[int]
+
+
+def weight_outcomes(
+    current_age: int,
+    depletion_age: np.ndarray,
+    net_worth_real: np.ndarray,
+    qx: np.ndarray,
+) -> pd.DataFrame:
+    """
+    Mortality-weights a batch of runs that all start at `current_age` and run
+    to MAX_AGE. `depletion_age` is (n,) with NaN for never depleted;
+    `net_worth_real` is (n, MAX_AGE - current_age + 1).
+
+    Someone who dies during the year at age a is ruined if depletion happened
+    at or before a, so P(ruin) is simply P(alive at the start of the
+    depletion year).
+    """
+    deaths = death_probabilities(qx, current_age)
+    alive = 1 - np.concatenate([[0.0], np.cumsum(deaths)[:-1]])
+
+    depleted = ~np.isnan(depletion_age)
+    offset = np.where(depleted, depletion_age - current_age, 0).astype(int)
+    # alive_from[i] = sum of P(alive) over the years from depletion onwards
+    alive_from = np.cumsum(alive[::-1])[::-1]
+
+    return pd.DataFrame(
+        {
+            "Depletion_Age": depletion_age,
+            "Ruin_Probability": np.where(depleted, alive[offset], 0.0),
+            "Expected_Years_Depleted": np.where(depleted, alive_from[offset], 0.0),
+            "Expected_Bequest_Real": net_worth_real @ deaths,
+        }
+    )
+
+
+def evaluate_longevity(
+    inputs: SimulationInputs, sex: str = "unisex"
+) -> LongevityOutcome:
+    """
+    Runs the simulation once to MAX_AGE (every shorter life_expectancy is a
+    prefix of that run) and weights the outcome by the life table conditional
+    on inputs.current_age.
+    """
+    full = dataclasses.replace(inputs, life_expectancy=MAX_AGE)
+    df, summary = run_simulation_with_summary(full)
+    depletion = np.nan if summary.depletion_age is None else summary.depletion_age
+
+    row = weight_outcomes(
+        inputs.current_age,
+        np.array([depletion], dtype=float),
+        df["Net_Worth_Real"].to_numpy()[None, :],
+        load_life_table(sex),
+    ).iloc[0]
+    return LongevityOutcome(
+        ruin_probability=float(row["Ruin_Probability"]),
+        expected_years_depleted=float(row["Expected_Years_Depleted"]),
+        expected_bequest_real=float(row["Expected_Bequest_Real"]),
+        depletion_age=summary.depletion_age,
+    )
+
+
+def evaluate_longevity_paths(
+    inputs: SimulationInputs, rates: RatePaths, sex: str = "unisex"
+) -> pd.DataFrame:
+    """
+    Vectorized evaluate_longevity over a batch of rate paths covering
+    current_age..MAX_AGE; returns one row of weighted outcomes per path.
+    The mean of Ruin_Probability is the overall chance of outliving savings.
+    """
+    full = dataclasses.replace(inputs, life_expectancy=MAX_AGE)
+    result = run_batch(full, rates)
+    return weight_outcomes(
+        inputs.current_age,
+        result.depletion_age,
+        result.columns["Net_Worth_Real"],
+        load_life_table(sex),
+    )
@@ -0,0 +1,189 @@
+# src/parallel.py
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from multiprocessing import Value
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+class SimulationCancelled(Exception):
+    """Raised when a sharded run is cancelled before all shards finished."""
+
+
+@dataclass
+class Shard:
+    index: int
+    start: int
+    stop: int
+    # Independent RNG stream for this shard, derived from the root seed
+    seed_seq: np.random.SeedSequence
+    # items[start:stop] when the run was given a sequence of items
+    items: Optional[Sequence] = None
+
+    @property
+    def size(self) -> int:
+        return self.stop - self.start
+
+
+def make_shards(
+    n_items: int, shard_size: int, seed: int = 0, items: Optional[Sequence] = None
+) -> list:
+    """
+    Splits `n_items` into fixed-size shards, one SeedSequence child each.
+
+    Shard boundaries and streams depend only on (n_items, shard_size, seed),
+    never on the worker count, which is what makes results reproducible
+    across machines and pool sizes.
+    """
+    n_shards = -(-n_items // shard_size)
+    seeds = np.random.SeedSequence(seed).spawn(n_shards)
+    shards = []
+    for index, seed_seq in enumerate(seeds):
+        start = index * shard_size
+        stop = min(start + shard_size, n_items)
+        shards.append(
+            Shard(
+                index,
+                start,
+                stop,
+                seed_seq,
+                items[start:stop] if items is not None else None,
+            )
+        )
+    return shards
+
+
+# --- WORKER SIDE ---
+_WORKER_SLOT = 0
+
+
+def _init_worker(slot_counter):
+    global _WORKER_SLOT
+    with slot_counter.get_lock():
+        _WORKER_SLOT = slot_counter.value
+        slot_counter.value += 1
+
+
+def _run_shard(task, shard: Shard, shm_name: str, shape, dtype, accumulate: bool):
+    # Pool workers share the parent's resource tracker, so attaching here does
+    # not take ownership; the parent unlinks the block once the run is over.
+    shm = SharedMemory(name=shm_name)
+    try:
+        out = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        view = out[_WORKER_SLOT] if accumulate else out[shard.start : shard.stop]
+        task(shard, view)
+        del out, view
+    finally:
+        shm.close()
+    return shard.index
+
+
+# --- SCHEDULER ---
+class ShardedRunner:
+    """
+    Runs a shard task over a process pool and merges results in shared memory.
+
+    `task(shard, out)` must be a picklable, module-level callable. It receives
+    either its own rows `out[shard.start:shard.stop]` of an (n_items, ...)
+    result (accumulate=False), or a per-worker slot of the result shape that it
+    adds into (accumulate=True); slots are summed at the end. Accumulated
+    results are bit-identical for any worker count only for integer dtypes.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+        cancel: Optional[threading.Event] = None,
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.progress = progress
+        self.cancel = cancel
+
+    def run(
+        self,
+        task: Callable,
+        shards: list,
+        shape: tuple,
+        dtype=np.float64,
+        accumulate: bool = False,
+    ) -> np.ndarray:
+        workers = min(self.max_workers, len(shards)) or 1
+        out_shape = (workers, *shape) if accumulate else tuple(shape)
+
+        if workers == 1:
+            out = np.zeros(out_shape, dtype=dtype)
+            for done, shard in enumerate(shards, start=1):
+                self._check_cancelled()
+                task(shard, out[0] if accumulate else out[shard.start : shard.stop])
+                self._report(done, len(shards))
+            return out.sum(axis=0, dtype=dtype) if accumulate else out
+
+        nbytes = max(int(np.prod(out_shape)) * np.dtype(dtype).itemsize, 1)
+        shm = SharedMemory(create=True, size=nbytes)
+        try:
+            out = np.ndarray(out_shape, dtype=dtype, buffer=shm.buf)
+            out[...] = 0
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(Value("i", 0),),
+            ) as pool:
+                pending = {
+                    pool.submit(
+                        _run_shard, task, shard, shm.name, out_shape, dtype, accumulate
+                    )
+                    for shard in shards
+                }
+                done = 0
+                try:
+                    while pending:
+                        self._check_cancelled()
+                        finished, pending = wait(
+                            pending, timeout=0.1, return_when=FIRST_COMPLETED
+                        )
+                        for future in finished:
+                            future.result()
+                            done += 1
+                        if finished:
+                            self._report(done, len(shards))
+                except BaseException:
+                    pool.shutdown(wait=True, cancel_futures=True)
+                    raise
+
+            result = out.sum(axis=0, dtype=dtype) if accumulate else out.copy()
+            del out
+            return result
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def _check_cancelled(self):
+        if self.cancel is not None and self.cancel.is_set():
+            raise SimulationCancelled()
+
+    def _report(self, done: int, total: int):
+        if self.progress is not None:
+            self.progress(done, total)
+
+
+def scaling_report(
+    run: Callable[[int], object], worker_counts: Sequence = (1, 2, 4, 8)
+) -> pd.DataFrame:
+    """Times `run(workers)` for each worker count; speedup is vs the first."""
+    rows = []
+    for workers in worker_counts:
+        started = time.perf_counter()
+        run(workers)
+        rows.append({"Workers": workers, "Seconds": time.perf_counter() - started})
+
+    df = pd.DataFrame(rows)
+    df["Speedup"] = df["Seconds"].iloc[0] / df["Seconds"]
+    df["Efficiency"] = df["Speedup"] / (df["Workers"] / df["Workers"].iloc[0])
+    return df
@@ -32,15 +32,8 @@ def create_nav_chart(df: pd.DataFrame, retire_age: int):
 
 
 def create_liquidity_runway(df: pd.DataFrame, retire_age: int, payout_age: int = 65):
-    # 1. Prepare Data
-    plot_df = df[df["Age"] >= retire_age].copy()
-
-    plot_df["Accessible_Funds"] = plot_df.apply(
-        lambda row: row["Liquid_Cash_Balance"]
-        if row["Age"] < 55
-        else (row["Liquid_Cash_Balance"] + row["OA_Total"] + row["SA_Total"]),
-        axis=1,
-    )
+    # 1. Prepare Data (the engine reports accessible liquidity per phase)
+    plot_df = df[df["Age"] >= retire_age]
 
     fig = go.Figure()
 
@@ -48,7 +41,7 @@ def create_liquidity_runway(df: pd.DataFrame, retire_age: int, payout_age: int =
     fig.add_trace(
         go.Scatter(
             x=plot_df["Age"],
-            y=plot_df["Accessible_Funds"],
+            y=plot_df["Accessible_Liquidity"],
             mode="lines",
             name="Accessible Funds",
             line=dict(color="#00CC96", width=4),
@@ -133,3 +126,59 @@ def create_liquidity_runway(df: pd.DataFrame, retire_age: int, payout_age: int =
     )
 
     return fig
+
+
+def create_fan_chart(percentiles: pd.DataFrame, retire_age: int):
+    # Monte Carlo fan: P5-P95 and P25-P75 bands around the median
+    fig = go.Figure()
+
+    bands = [
+        ("P5", "P95", "rgba(99, 110, 250, 0.15)", "5th-95th"),
+        ("P25", "P75", "rgba(99, 110, 250, 0.3)", "25th-75th"),
+    ]
+    for low, high, color, name in bands:
+        if low not in percentiles or high not in percentiles:
+            continue
+        fig.add_trace(
+            go.Scatter(
+                x=percentiles["Age"],
+                y=percentiles[high],
+                mode="lines",
+                line=dict(width=0),
+                showlegend=False,
+                hoverinfo="skip",
+            )
+        )
+        fig.add_trace(
+            go.Scatter(
+                x=percentiles["Age"],
+                y=percentiles[low],
+                mode="lines",
+                line=dict(width=0),
+                fill="tonexty",
+                fillcolor=color,
+                name=name,
+            )
+        )
+
+    if "P50" in percentiles:
+        fig.add_trace(
+            go.Scatter(
+                x=percentiles["Age"],
+                y=percentiles["P50"],
+                mode="lines",
+                name="Median",
+                line=dict(color="#636EFA", width=3),
+            )
+        )
+
+    fig.add_vline(
+        x=retire_age, line_dash="dash", line_color="white", annotation_text="Retirement"
+    )
+    fig.update_layout(
+        xaxis_title="Age",
+        yaxis_title="Net Worth ($ Today)",
+        hovermode="x unified",
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+    )
+    return fig
@@ -0,0 +1,104 @@
+# src/scenarios.py
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+from src.constants import SCENARIO_FACTORS
+from src.models import SimulationInputs
+from src.parallel import make_shards
+
+
+@dataclass
+class Regime:
+    # Annual mean and covariance of (cash, OA invested, SA invested, inflation)
+    means: np.ndarray
+    cov: np.ndarray
+
+
+@dataclass
+class ScenarioModel:
+    """
+    Jointly samples the four rate factors in SCENARIO_FACTORS order.
+
+    With one regime every year is an independent multivariate normal draw.
+    With several, each path follows a Markov chain over the regimes:
+    `transition[i, j]` is the chance of moving from regime i to j between
+    years, and `initial` the starting distribution (defaults to uniform).
+    """
+
+    regimes: list
+    transition: np.ndarray = field(default_factory=lambda: np.ones((1, 1)))
+    initial: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_inputs(
+        cls,
+        inputs: SimulationInputs,
+        vols=(0.0, 0.10, 0.10, 0.01),
+        corr: Optional[np.ndarray] = None,
+    ) -> "ScenarioModel":
+        """Single regime centred on the rates in `inputs`."""
+        means = np.array([getattr(inputs, name) for name in SCENARIO_FACTORS])
+        vols = np.asarray(vols, dtype=float)
+        corr = np.eye(len(SCENARIO_FACTORS)) if corr is None else np.asarray(corr)
+        return cls(regimes=[Regime(means, corr * np.outer(vols, vols))])
+
+    def sample(
+        self, rng: np.random.Generator, n_paths: int, n_years: int
+    ) -> np.ndarray:
+        """Returns an (n_paths, n_years, n_factors) block of rates."""
+        n_regimes = len(self.regimes)
+        n_factors = len(SCENARIO_FACTORS)
+        # Root R with R @ R.T == cov from eigh; unlike Cholesky it tolerates
+        # singular covariances (zero-vol factors)
+        roots = []
+        for regime in self.regimes:
+            vals, vecs = np.linalg.eigh(regime.cov)
+            roots.append(vecs * np.sqrt(np.clip(vals, 0, None)))
+
+        initial = (
+            np.full(n_regimes, 1 / n_regimes) if self.initial is None else self.initial
+        )
+        state = rng.choice(n_regimes, size=n_paths, p=initial)
+        cum_transition = np.cumsum(self.transition, axis=1)
+
+        out = np.empty((n_paths, n_years, n_factors))
+        for t in range(n_years):
+            if t > 0 and n_regimes > 1:
+                u = rng.random(n_paths)[:, None]
+                state = np.minimum(
+                    (u > cum_transition[state]).sum(axis=1), n_regimes - 1
+                )
+            z = rng.standard_normal((n_paths, n_factors))
+            for r, regime in enumerate(self.regimes):
+                mask = state == r
+                out[mask, t] = regime.means + z[mask] @ roots[r].T
+        return out
+
+
+def write_cube(
+    path: str,
+    model: ScenarioModel,
+    n_paths: int,
+    n_years: int,
+    seed: int = 0,
+    chunk_size: int = 10_000,
+) -> np.memmap:
+    """
+    Samples `n_paths` paths into a memory-mapped .npy cube shaped
+    (paths, years, factors), one chunk at a time. Each chunk has its own RNG
+    stream derived from `seed`, so a cube is reproducible from its arguments.
+    """
+    shape = (n_paths, n_years, len(SCENARIO_FACTORS))
+    cube = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=shape)
+    for shard in make_shards(n_paths, chunk_size, seed):
+        rng = np.random.default_rng(shard.seed_seq)
+        cube[shard.start : shard.stop] = model.sample(rng, shard.size, n_years)
+    cube.flush()
+    return cube
+
+
+def open_cube(path: str) -> np.memmap:
+    """Read-only, zero-copy view of a cube written by write_cube."""
+    return np.load(path, mmap_mode="r")
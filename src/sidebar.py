@@ -1,7 +1,95 @@
+import dataclasses
 import streamlit as st
 import json
+import pandas as pd
+from src.config import EVENT_AGE_LIMITS, ConfigValidationError, load_config
+from src.config import SIDEBAR_LIMITS as LIMITS
 from src.models import SimulationInputs
 from src.defaults import get_singapore_default_inputs
+from src.events import EVENT_ACCOUNTS, EVENT_FIELDS, EVENT_KINDS, events_from_records
+
+
+def _event_records() -> list:
+    """
+    Current life events: the stored list plus any pending edits from the
+    data editor, so export and the engine see edits made on this rerun.
+    """
+    records = [dict(r) for r in st.session_state.get("events", [])]
+    delta = st.session_state.get("events_editor")
+    if not delta:
+        return records
+    for idx, changes in delta.get("edited_rows", {}).items():
+        records[int(idx)].update(changes)
+    deleted = set(delta.get("deleted_rows", []))
+    records = [r for i, r in enumerate(records) if i not in deleted]
+    return records + [dict(r) for r in delta.get("added_rows", [])]
+
+
+def _split_events(records: list) -> tuple:
+    """
+    (usable, ignored) event records: only spend changes may be negative (a
+    step-down in spending), so other negative amounts are ignored.
+    """
+    usable, ignored = [], []
+    for record in records:
+        amount = record.get("amount")
+        if record.get("kind") != "spend_change" and amount and amount < 0:
+            ignored.append(record)
+        else:
+            usable.append(record)
+    return usable, ignored
+
+
+def _load_settings(settings: dict):
+    for key, value in settings.items():
+        st.session_state[key] = value
+    # The editor's pending edits refer to the old event list
+    st.session_state.pop("events_editor", None)
+
+
+@st.fragment
+def _render_data_manager():
+    # Runs as a fragment: downloading, uploading or inspecting a config only
+    # reruns this expander, not the engine and charts. Applying settings
+    # escalates to a full-app rerun via st.rerun().
+    with st.expander("📂 Import / Export / Defaults", expanded=False):
+        if st.button("Reset to Typical SG Stats"):
+            _load_settings(get_singapore_default_inputs())
+            st.rerun()
+
+        current_config = {
+            k: st.session_state[k]
+            for k in get_singapore_default_inputs().keys()
+            if k in st.session_state
+        }
+        # Exactly the events the engine runs on, so the file loads back
+        usable, _ = _split_events(_event_records())
+        current_config["events"] = [
+            dataclasses.asdict(event) for event in events_from_records(usable)
+        ]
+        json_string = json.dumps(current_config, indent=2)
+        st.download_button(
+            "Download Settings (JSON)",
+            json_string,
+            "fire_config.json",
+            "application/json",
+        )
+
+        uploaded_file = st.file_uploader("Upload Config", type=["json"])
+        if uploaded_file is not None:
+            try:
+                _load_settings(load_config(json.load(uploaded_file)))
+                st.success("Loaded!")
+                if st.button("Apply Loaded Settings"):
+                    st.rerun()
+            except ConfigValidationError as e:
+                # Nothing is applied unless every field checks out
+                st.error("Config rejected:")
+                st.dataframe(
+                    e.errors[["Field", "Value", "Error"]].astype(str), hide_index=True
+                )
+            except Exception as e:
+                st.error(f"Error loading file: {e}")
 
 
 def render_sidebar() -> SimulationInputs:
@@ -15,62 +103,46 @@ def render_sidebar() -> SimulationInputs:
         st.title("⚙️ Controls")
 
         # --- SECTION 0: DATA MANAGER ---
-        with st.expander("📂 Import / Export / Defaults", expanded=False):
-            if st.button("Reset to Typical SG Stats"):
-                defaults = get_singapore_default_inputs()
-                for key, value in defaults.items():
-                    st.session_state[key] = value
-                st.rerun()
-
-            current_config = {
-                k: st.session_state[k]
-                for k in get_singapore_default_inputs().keys()
-                if k in st.session_state
-            }
-            json_string = json.dumps(current_config, indent=2)
-            st.download_button(
-                "Download Settings (JSON)",
-                json_string,
-                "fire_config.json",
-                "application/json",
-            )
-
-            uploaded_file = st.file_uploader("Upload Config", type=["json"])
-            if uploaded_file is not None:
-                try:
-                    data = json.load(uploaded_file)
-                    for key, value in data.items():
-                        st.session_state[key] = value
-                    st.success("Loaded!")
-                    if st.button("Apply Loaded Settings"):
-                        st.rerun()
-                except Exception as e:
-                    st.error(f"Error loading file: {e}")
+        _render_data_manager()
 
         # --- SECTION 1: PERSONAL ---
         st.header("1. Personal Details")
         c1, c2 = st.columns(2)
-        c1.number_input("Current Age", 20, 80, key="current_age")
-        c2.number_input("Retire Age", 30, 80, key="retire_age")
+        c1.number_input("Current Age", *LIMITS["current_age"], key="current_age")
+        c2.number_input("Retire Age", *LIMITS["retire_age"], key="retire_age")
 
         c3, c4 = st.columns(2)
-        c3.number_input("Life Expectancy", 70, 110, key="life_expectancy")
-        c4.number_input("Inflation (%)", 0.0, 15.0, step=0.1, key="inflation_rate")
+        c3.number_input(
+            "Life Expectancy", *LIMITS["life_expectancy"], key="life_expectancy"
+        )
+        c4.number_input(
+            "Inflation (%)", *LIMITS["inflation_rate"], step=0.1, key="inflation_rate"
+        )
 
         # --- SECTION 2: LIFESTYLE ---
         st.header("2. Lifestyle ($ Today)")
         st.number_input(
-            "Bridge Spend (Retire-55)", 0, 50000, step=100, key="spend_bridge"
+            "Bridge Spend (Retire-55)",
+            *LIMITS["spend_bridge"],
+            step=100,
+            key="spend_bridge",
         )
         st.number_input(
-            "Unlock Spend (55-Payout)", 0, 50000, step=100, key="spend_unlock"
+            "Unlock Spend (55-Payout)",
+            *LIMITS["spend_unlock"],
+            step=100,
+            key="spend_unlock",
+        )
+        st.number_input(
+            "Late Spend (Payout+)", *LIMITS["spend_late"], step=100, key="spend_late"
         )
-        st.number_input("Late Spend (Payout+)", 0, 50000, step=100, key="spend_late")
 
         # --- SECTION 3: CPF SETTINGS ---
         st.header("3. CPF Settings")
-        st.number_input("Target RA Amount @ 55", 0, 1000000, step=1000, key="ra_target")
-        st.slider("Payout Start Age", 65, 70, key="payout_age")
+        st.number_input(
+            "Target RA Amount @ 55", *LIMITS["ra_target"], step=1000, key="ra_target"
+        )
+        st.slider("Payout Start Age", *LIMITS["payout_age"], key="payout_age")
 
         # --- SECTION 4: ASSETS (EXPLICIT SPLIT) ---
         st.header("4. Assets Breakdown")
@@ -78,33 +150,39 @@ def render_sidebar() -> SimulationInputs:
         # CASH
         st.subheader("💵 Cash")
         c_bal, c_apy = st.columns([2, 1])
-        c_bal.number_input("Total Cash Balance", 0, 10000000, step=1000, key="cash_inv")
-        c_apy.number_input("APY %", 0.0, 20.0, step=0.1, key="cash_apy")
-        st.number_input("Monthly Cash Top-up", 0, 50000, key="cash_topup")
+        c_bal.number_input(
+            "Total Cash Balance", *LIMITS["cash_inv"], step=1000, key="cash_inv"
+        )
+        c_apy.number_input("APY %", *LIMITS["cash_apy"], step=0.1, key="cash_apy")
+        st.number_input("Monthly Cash Top-up", *LIMITS["cash_topup"], key="cash_topup")
 
         # CPF OA
         st.subheader("🏠 CPF OA")
         st.caption("Liquid earns 2.5%. Invested earns custom rate.")
 
         o_liq, o_inv = st.columns(2)
-        o_liq.number_input("Liquid OA (2.5%)", 0, 5000000, step=1000, key="oa_bal")
-        o_inv.number_input("Invested OA", 0, 5000000, step=1000, key="oa_inv")
+        o_liq.number_input(
+            "Liquid OA (2.5%)", *LIMITS["oa_bal"], step=1000, key="oa_bal"
+        )
+        o_inv.number_input("Invested OA", *LIMITS["oa_inv"], step=1000, key="oa_inv")
 
         o_apy_col, o_top_col = st.columns([1, 2])
-        o_apy_col.number_input("Inv APY %", 0.0, 20.0, step=0.1, key="oa_apy")
-        o_top_col.number_input("Monthly OA Top-up", 0, 50000, key="oa_topup")
+        o_apy_col.number_input("Inv APY %", *LIMITS["oa_apy"], step=0.1, key="oa_apy")
+        o_top_col.number_input("Monthly OA Top-up", *LIMITS["oa_topup"], key="oa_topup")
 
         # CPF SA
         st.subheader("🛡️ CPF SA")
         st.caption("Liquid earns 4.0%. Invested earns custom rate.")
 
         s_liq, s_inv = st.columns(2)
-        s_liq.number_input("Liquid SA (4.0%)", 0, 5000000, step=1000, key="sa_bal")
-        s_inv.number_input("Invested SA", 0, 5000000, step=1000, key="sa_inv")
+        s_liq.number_input(
+            "Liquid SA (4.0%)", *LIMITS["sa_bal"], step=1000, key="sa_bal"
+        )
+        s_inv.number_input("Invested SA", *LIMITS["sa_inv"], step=1000, key="sa_inv")
 
         s_apy_col, s_top_col = st.columns([1, 2])
-        s_apy_col.number_input("Inv APY %", 0.0, 20.0, step=0.1, key="sa_apy")
-        s_top_col.number_input("Monthly SA Top-up", 0, 50000, key="sa_topup")
+        s_apy_col.number_input("Inv APY %", *LIMITS["sa_apy"], step=0.1, key="sa_apy")
+        s_top_col.number_input("Monthly SA Top-up", *LIMITS["sa_topup"], key="sa_topup")
 
         # --- SECTION 5: LIABILITIES ---
         st.header("5. Liabilities")
@@ -113,19 +191,24 @@ def render_sidebar() -> SimulationInputs:
         st.markdown("**House Loan**")
         st.number_input(
             "Remaining Amount",
-            0,
-            5000000,
+            *LIMITS["house_loan_amt"],
             key="house_loan_amt",
             label_visibility="collapsed",
         )
 
         if st.session_state.house_loan_amt > 0:
             h1, h2, h3 = st.columns(3)
-            h1.number_input("Start Age", 20, 70, key="house_start_age")
-            h2.number_input("Tenure", 1, 40, key="house_tenure")
-            h3.number_input("Rate %", 0.0, 10.0, step=0.1, key="house_rate")
+            h1.number_input(
+                "Start Age", *LIMITS["house_start_age"], key="house_start_age"
+            )
+            h2.number_input("Tenure", *LIMITS["house_tenure"], key="house_tenure")
+            h3.number_input("Rate %", *LIMITS["house_rate"], step=0.1, key="house_rate")
             # RESTORED: Downpayment Field
-            st.number_input("Downpayment (Cash)", 0, 1000000, key="house_downpayment")
+            st.number_input(
+                "Downpayment (Cash)",
+                *LIMITS["house_downpayment"],
+                key="house_downpayment",
+            )
 
         st.markdown("---")
 
@@ -133,19 +216,67 @@ def render_sidebar() -> SimulationInputs:
         st.markdown("**Car Loan**")
         st.number_input(
             "Remaining Amount",
-            0,
-            500000,
+            *LIMITS["car_loan_amt"],
             key="car_loan_amt",
             label_visibility="collapsed",
         )
 
         if st.session_state.car_loan_amt > 0:
             c1, c2, c3 = st.columns(3)
-            c1.number_input("Start Age", 20, 70, key="car_start_age")
-            c2.number_input("Tenure", 1, 10, key="car_tenure")
-            c3.number_input("Rate %", 0.0, 10.0, step=0.1, key="car_rate")
+            c1.number_input("Start Age", *LIMITS["car_start_age"], key="car_start_age")
+            c2.number_input("Tenure", *LIMITS["car_tenure"], key="car_tenure")
+            c3.number_input("Rate %", *LIMITS["car_rate"], step=0.1, key="car_rate")
             # RESTORED: Downpayment Field
-            st.number_input("Downpayment (Cash)", 0, 200000, key="car_downpayment")
+            st.number_input(
+                "Downpayment (Cash)", *LIMITS["car_downpayment"], key="car_downpayment"
+            )
+
+        # --- SECTION 6: LIFE EVENTS ---
+        st.header("6. Life Events")
+        st.caption(
+            "Windfall/expense: lump sum per year in the age range. "
+            "Top-up: extra monthly contribution. Spend change: monthly $ today "
+            "(blank End Age = one-off, or for the rest of life for spend changes; "
+            "negative to cut spending)."
+        )
+        st.data_editor(
+            pd.DataFrame(st.session_state.get("events", []), columns=EVENT_FIELDS),
+            key="events_editor",
+            num_rows="dynamic",
+            hide_index=True,
+            column_config={
+                "kind": st.column_config.SelectboxColumn(
+                    "Type", options=EVENT_KINDS, required=True
+                ),
+                # Unbounded so spend changes can go down; negative money
+                # events are dropped below
+                "amount": st.column_config.NumberColumn(
+                    "Amount", step=100, required=True
+                ),
+                "start_age": st.column_config.NumberColumn(
+                    "Start Age",
+                    min_value=EVENT_AGE_LIMITS[0],
+                    max_value=EVENT_AGE_LIMITS[1],
+                    step=1,
+                    required=True,
+                ),
+                "end_age": st.column_config.NumberColumn(
+                    "End Age",
+                    min_value=EVENT_AGE_LIMITS[0],
+                    max_value=EVENT_AGE_LIMITS[1],
+                    step=1,
+                ),
+                "account": st.column_config.SelectboxColumn(
+                    "Account", options=EVENT_ACCOUNTS, default="cash"
+                ),
+                "label": st.column_config.TextColumn("Label"),
+            },
+        )
+
+        events, ignored = _split_events(_event_records())
+        for record in ignored:
+            label = record.get("label") or record.get("kind")
+            st.warning(f"Ignoring '{label}': only spend changes can be negative.")
 
     # Pack into Object
     return SimulationInputs(
@@ -179,4 +310,5 @@ def render_sidebar() -> SimulationInputs:
         car_downpayment=st.session_state.get("car_downpayment", 0),
         car_tenure=st.session_state.get("car_tenure", 7),
         car_rate=st.session_state.get("car_rate", 2.78) / 100.0,
+        events=events_from_records(events),
     )
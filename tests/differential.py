@@ -0,0 +1,270 @@
+# tests/differential.py
+"""
+Differential harness: every registered engine variant is run on the same
+SimulationInputs as the reference engine (run_simulation_with_summary with the
+plain year loop) and must match it column by column, and on every
+SimulationSummary KPI, within the engine's tolerance.
+
+Register a new fast path with @register_engine and it is picked up by
+tests/test_differential.py. Set FIRE_FUZZ_EXAMPLES to fuzz more configs.
+"""
+
+import dataclasses
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.batch import RatePaths, run_batch
+from src.config import SCHEMA
+from src.engine import run_simulation_with_summary
+from src.models import LifeEvent, SimulationInputs, SimulationSummary
+
+# Sidebar bounds in engine units (percent fields are fractions here)
+INT_BOUNDS = {
+    name: (spec.lo, spec.hi) for name, spec in SCHEMA.items() if spec.kind is int
+}
+FLOAT_BOUNDS = {
+    name: (spec.lo / 100, spec.hi / 100) if spec.percent else (spec.lo, spec.hi)
+    for name, spec in SCHEMA.items()
+    if spec.kind is float
+}
+RATE_FIELDS = {name for name, spec in SCHEMA.items() if spec.percent}
+
+
+@dataclass
+class Engine:
+    name: str
+    # Returns the results frame and the run's KPIs
+    run: Callable[[SimulationInputs], tuple[pd.DataFrame, SimulationSummary]]
+    rel: float = 1e-9
+    # Dollar tolerance; covers values that should be ~0 but carry rounding
+    abs: float = 1e-6
+    # Measure `rel` against the largest value in the reference run instead of
+    # each value, for engines whose error comes from cancellation against
+    # large balances (money moves between columns, so a column's own peak
+    # is not enough)
+    rel_to_peak: bool = False
+
+
+ENGINES = {}
+
+
+def register_engine(
+    name: str, rel: float = 1e-9, abs: float = 1e-6, rel_to_peak: bool = False
+):
+    def decorator(run):
+        ENGINES[name] = Engine(name, run, rel, abs, rel_to_peak)
+        return run
+
+    return decorator
+
+
+def reference(inputs: SimulationInputs) -> tuple[pd.DataFrame, SimulationSummary]:
+    return run_simulation_with_summary(inputs, closed_form=False)
+
+
+def _batch_frame(
+    inputs: SimulationInputs, **kwargs
+) -> tuple[pd.DataFrame, SimulationSummary]:
+    """Path 0 of run_batch as a frame and a summary (NaN KPIs become None)."""
+    result = run_batch(inputs, RatePaths.constant(inputs), **kwargs)
+    summary = SimulationSummary()
+    for field in dataclasses.fields(SimulationSummary):
+        value = float(getattr(result, field.name)[0])
+        setattr(summary, field.name, None if np.isnan(value) else value)
+    if summary.bridge_cash_left is None:
+        summary.bridge_safe = None
+    if len(result.ages) == 0:
+        return pd.DataFrame(), summary
+    columns = {name: values[0] for name, values in result.columns.items()}
+    return pd.DataFrame({"Age": result.ages, **columns}), summary
+
+
+@register_engine("closed_form")
+def _closed_form(inputs):
+    return run_simulation_with_summary(inputs, closed_form=True)
+
+
+@register_engine("batch")
+def _batch(inputs):
+    return _batch_frame(inputs)
+
+
+@register_engine("batch_stepwise")
+def _batch_stepwise(inputs):
+    return _batch_frame(inputs, closed_form=False)
+
+
+# float32 loses ~1e-7 per operation, compounded over up to 90 years of
+# flows; 1000 fuzzed configs peak at ~4e-5 of the largest balance
+@register_engine("batch_float32", rel=1e-4, abs=1.0, rel_to_peak=True)
+def _batch_float32(inputs):
+    return _batch_frame(inputs, dtype=np.float32)
+
+
+# --- GENERATORS ---
+def random_inputs(rng: np.random.Generator) -> SimulationInputs:
+    """A random config inside the sidebar bounds, with 0-3 life events."""
+    values = {}
+    for name, (lo, hi) in INT_BOUNDS.items():
+        values[name] = int(rng.integers(lo, hi + 1))
+    for name, (lo, hi) in FLOAT_BOUNDS.items():
+        if name in RATE_FIELDS:
+            values[name] = round(float(rng.uniform(lo, hi)), 3)
+        elif rng.random() < 0.2:
+            values[name] = 0.0  # zero balances / loans are common
+        else:
+            # Log-uniform so small and large amounts both show up
+            values[name] = round(float(np.exp(rng.uniform(0, np.log(hi + 1)))) - 1)
+    values["life_expectancy"] = max(values["life_expectancy"], values["current_age"])
+
+    events = []
+    for _ in range(rng.integers(0, 4)):
+        start = int(rng.integers(values["current_age"], values["life_expectancy"] + 1))
+        end = int(rng.integers(start, values["life_expectancy"] + 1))
+        events.append(
+            LifeEvent(
+                kind=str(rng.choice(["windfall", "expense", "topup", "spend_change"])),
+                amount=float(rng.integers(1, 200) * 500),
+                start_age=start,
+                end_age=None if rng.random() < 0.5 else end,
+                account=str(rng.choice(["cash", "oa", "sa"])),
+            )
+        )
+    return SimulationInputs(**values, events=events)
+
+
+def edge_cases(base: SimulationInputs) -> dict:
+    """Named configs around the engine's branch points, built from `base`."""
+
+    def variant(**changes):
+        return dataclasses.replace(base, **changes)
+
+    return {
+        "retired_before_current_age": variant(current_age=60, retire_age=45),
+        "zero_balances": variant(
+            cash_inv=0.0,
+            oa_bal=0.0,
+            oa_inv=0.0,
+            sa_bal=0.0,
+            sa_inv=0.0,
+            cash_topup=0.0,
+            oa_topup=0.0,
+            sa_topup=0.0,
+        ),
+        "loans_after_55": variant(
+            house_loan_amt=300_000.0,
+            house_start_age=60,
+            car_loan_amt=80_000.0,
+            car_start_age=57,
+            car_downpayment=20_000.0,
+        ),
+        "payout_at_70": variant(payout_age=70),
+        "starts_at_55": variant(current_age=55, retire_age=55),
+        "one_year_horizon": variant(current_age=80, life_expectancy=80),
+        "current_age_past_horizon": variant(current_age=80, life_expectancy=70),
+        "zero_ra_target": variant(ra_target=0.0),
+        "events_everywhere": variant(
+            events=[
+                LifeEvent("windfall", 100_000.0, 45, account="oa"),
+                LifeEvent("expense", 500_000.0, 50, 52),
+                LifeEvent("topup", 300.0, base.current_age, 54, account="sa"),
+                LifeEvent("spend_change", -500.0, 70),
+            ]
+        ),
+    }
+
+
+# --- COMPARISON ---
+def compare(engine: Engine, inputs: SimulationInputs) -> Optional[str]:
+    """None if `engine` matches the reference on `inputs`, else a description."""
+    expected, expected_summary = reference(inputs)
+    peak = np.abs(expected.drop(columns="Age", errors="ignore").to_numpy(float))
+    peak = peak.max(initial=0.0)
+    try:
+        actual, actual_summary = engine.run(inputs)
+    except Exception as e:
+        return f"{engine.name} raised {e!r}"
+
+    if len(actual) != len(expected):
+        return f"{engine.name} returned {len(actual)} rows, expected {len(expected)}"
+    for column in expected.columns:
+        if column not in actual:
+            return f"{engine.name} is missing column {column}"
+        want = expected[column].to_numpy(dtype=float)
+        got = actual[column].to_numpy(dtype=float)
+        error = np.abs(got - want)
+        scale = peak if engine.rel_to_peak else np.abs(want)
+        bad = error > engine.abs + engine.rel * scale
+        if bad.any():
+            i = int(np.argmax(bad))
+            return (
+                f"{engine.name} {column} at age {expected['Age'].iloc[i]}: "
+                f"{got[i]!r} != {want[i]!r}"
+            )
+
+    def close(got: float, want: float) -> bool:
+        scale = peak if engine.rel_to_peak else abs(want)
+        return abs(got - want) <= engine.abs + engine.rel * scale
+
+    # None (age outside the horizon, never depleted) only matches None
+    for field in dataclasses.fields(SimulationSummary):
+        want = getattr(expected_summary, field.name)
+        got = getattr(actual_summary, field.name)
+        if (got is None) != (want is None) or (
+            want is not None and not close(float(got), float(want))
+        ):
+            return f"{engine.name} summary {field.name}: {got!r} != {want!r}"
+    return None
+
+
+def _candidates(name: str, value):
+    """Simpler values to try for one field, simplest first."""
+    if name == "events":
+        return [value[:i] + value[i + 1 :] for i in range(len(value))]
+    if name in INT_BOUNDS:
+        lo, _ = INT_BOUNDS[name]
+        return [v for v in (lo, (lo + value) // 2, value - 1) if lo <= v < value]
+    if value == 0:
+        return []
+    half = round(value / 2, 3) if name in RATE_FIELDS else float(round(value / 2))
+    return [v for v in (0.0, half) if abs(v) < abs(value)]
+
+
+def shrink(
+    inputs: SimulationInputs, fails: Callable[[SimulationInputs], bool]
+) -> SimulationInputs:
+    """
+    Greedy shrink: repeatedly replaces one field with a simpler value (bound,
+    zero, half, one fewer event) while `fails` still holds, until no single
+    change keeps it failing.
+    """
+    current = inputs
+    changed = True
+    while changed:
+        changed = False
+        for name in [f.name for f in dataclasses.fields(SimulationInputs)]:
+            for candidate in _candidates(name, getattr(current, name)):
+                trial = dataclasses.replace(current, **{name: candidate})
+                if fails(trial):
+                    current, changed = trial, True
+                    break
+    return current
+
+
+def check(engine: Engine, inputs: SimulationInputs) -> Optional[str]:
+    """compare(), and on a mismatch the message for the shrunk config."""
+    failure = compare(engine, inputs)
+    if failure is None:
+        return None
+
+    def still_fails(candidate):
+        try:
+            return compare(engine, candidate) is not None
+        except Exception:  # the reference itself rejects the candidate
+            return False
+
+    minimal = shrink(inputs, still_fails)
+    return f"{compare(engine, minimal)}\nMinimal failing inputs: {minimal!r}"
@@ -0,0 +1,87 @@
+# tests/test_config.py
+import pytest
+from src.config import (
+    SCHEMA,
+    SIDEBAR_LIMITS,
+    ConfigValidationError,
+    load_config,
+    validate_configs,
+)
+from src.defaults import get_singapore_default_inputs
+
+
+def test_schema_covers_every_scalar_input():
+    assert set(SCHEMA) == set(SIDEBAR_LIMITS)
+    assert SCHEMA["current_age"].kind is int
+    assert SCHEMA["cash_apy"].percent
+
+
+def test_defaults_convert_to_engine_units():
+    batch = validate_configs([get_singapore_default_inputs()])
+    assert batch.errors.empty
+    inputs = batch.inputs[0]
+    assert inputs.inflation_rate == pytest.approx(0.025)
+    assert inputs.current_age == 30 and isinstance(inputs.current_age, int)
+
+
+def test_legacy_frs_target_is_migrated():
+    settings = load_config({"frs_target": 150000})
+    assert settings["ra_target"] == 150000
+    assert "frs_target" not in settings
+    # Missing fields fall back to the defaults
+    assert settings["payout_age"] == get_singapore_default_inputs()["payout_age"]
+
+
+def test_batch_reports_each_bad_field():
+    good = get_singapore_default_inputs()
+    configs = [
+        good,
+        {**good, "retire_age": 30.5, "cash_apy": "6", "colour": "red"},
+        {**good, "payout_age": 75},
+        {**good, "events": [{"kind": "lottery", "amount": 1, "start_age": 40}]},
+        ["not", "a", "config"],
+        {**good, "current_age": 45.0},
+    ]
+    batch = validate_configs(configs)
+
+    assert batch.accepted.tolist() == [0, 5]
+    assert [i.current_age for i in batch.inputs] == [30, 45]
+    report = {(row.Config, row.Field) for row in batch.errors.itertuples()}
+    assert report == {
+        (1, "retire_age"),
+        (1, "cash_apy"),
+        (1, "colour"),
+        (2, "payout_age"),
+        (3, "events[0].kind"),
+        (4, ""),
+    }
+    range_error = batch.errors.set_index("Field").loc["payout_age", "Error"]
+    assert range_error == "must be between 65 and 70"
+
+
+def test_load_config_raises_with_report():
+    with pytest.raises(ConfigValidationError, match="house_tenure") as info:
+        load_config({"house_tenure": 0})
+    assert info.value.errors["Field"].tolist() == ["house_tenure"]
+
+
+def test_spend_change_may_be_negative():
+    event = {"kind": "spend_change", "amount": -500, "start_age": 70}
+    settings = load_config({"events": [event]})
+    assert settings["events"] == [event]
+
+    with pytest.raises(ConfigValidationError, match=r"events\[0\].amount"):
+        load_config({"events": [{**event, "kind": "expense"}]})
+
+
+def test_blank_event_account_means_cash():
+    event = {"kind": "windfall", "amount": 1000, "start_age": 40, "account": None}
+    batch = validate_configs([{"events": [event]}])
+    assert batch.errors.empty
+    assert batch.inputs[0].events[0].account == "cash"
+
+
+def test_empty_batch():
+    batch = validate_configs([])
+    assert batch.inputs == [] and len(batch.accepted) == 0
+    assert batch.errors.empty
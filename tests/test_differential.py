@@ -0,0 +1,63 @@
+# tests/test_differential.py
+import os
+
+import numpy as np
+import pytest
+from tests.differential import (
+    ENGINES,
+    Engine,
+    check,
+    compare,
+    edge_cases,
+    random_inputs,
+    reference,
+    shrink,
+)
+
+N_EXAMPLES = int(os.environ.get("FIRE_FUZZ_EXAMPLES", "25"))
+
+
+@pytest.mark.parametrize("engine", ENGINES.values(), ids=ENGINES.keys())
+def test_edge_cases_match_reference(default_inputs, engine):
+    failures = [
+        f"[{name}] {failure}"
+        for name, inputs in edge_cases(default_inputs).items()
+        if (failure := check(engine, inputs)) is not None
+    ]
+    assert not failures, "\n".join(failures)
+
+
+@pytest.mark.parametrize("engine", ENGINES.values(), ids=ENGINES.keys())
+def test_random_inputs_match_reference(engine):
+    rng = np.random.default_rng(2024)
+    for example in range(N_EXAMPLES):
+        failure = check(engine, random_inputs(rng))
+        assert failure is None, f"example {example}: {failure}"
+
+
+def test_shrink_finds_minimal_config():
+    """A planted bug (loans before retirement) shrinks to just those fields."""
+    rng = np.random.default_rng(0)
+    inputs = random_inputs(rng)
+    inputs.house_loan_amt, inputs.retire_age = 250_000.0, 60
+
+    def fails(c):
+        return c.house_loan_amt > 1000 and c.retire_age > 50
+
+    minimal = shrink(inputs, fails)
+    assert fails(minimal)
+    assert minimal.retire_age == 51
+    assert 1000 < minimal.house_loan_amt <= 2000
+    assert minimal.cash_inv == 0 and minimal.events == []
+
+
+def test_summary_drift_is_reported(default_inputs):
+    """A fast path that agrees on every column but not on a KPI still fails."""
+
+    def drifted(inputs):
+        df, summary = reference(inputs)
+        summary.min_accessible_liquidity += 1_000.0
+        return df, summary
+
+    failure = compare(Engine("drifted", drifted), default_inputs)
+    assert failure is not None and "min_accessible_liquidity" in failure
@@ -1,6 +1,8 @@
 # tests/test_engine.py
 import pytest
-from src.engine import run_simulation
+from src.closed_form import quiet_runs
+from src.engine import run_simulation, run_simulation_with_summary
+from src.events import build_schedule, house_payment
 
 
 def test_simulation_duration(default_inputs):
@@ -113,3 +115,101 @@ def test_frs_lock_at_55(default_inputs):
     # Check SA was drained/reduced
     # SA started at 150k. FRS took 100k. SA should be ~50k (plus growth)
     assert row_55["SA_Total"] < 100000  # It should have dropped significantly
+
+
+def test_real_columns_deflate_nominal(default_inputs):
+    """Real columns equal nominal ones divided by cumulative inflation."""
+    df = run_simulation(default_inputs)
+    years = df["Age"] - default_inputs.current_age
+    deflator = (1 + default_inputs.inflation_rate) ** years
+
+    assert df["Net_Worth_Real"].iloc[0] == pytest.approx(df["Net_Worth"].iloc[0])
+    assert (df["Net_Worth_Real"] * deflator).to_numpy() == pytest.approx(
+        df["Net_Worth"].to_numpy()
+    )
+
+
+def test_summary_matches_frame(default_inputs):
+    """KPIs collected in the loop agree with a rescan of the results frame."""
+    df, summary = run_simulation_with_summary(default_inputs)
+
+    def row(age):
+        return df[df["Age"] == age].iloc[0]
+
+    assert summary.net_worth_at_retire == pytest.approx(
+        row(default_inputs.retire_age)["Net_Worth"]
+    )
+    assert summary.bridge_cash_left == pytest.approx(row(54)["Liquid_Cash_Balance"])
+    assert summary.bridge_safe == (row(54)["Liquid_Cash_Balance"] > 0)
+    assert summary.cpf_surplus_at_55 == pytest.approx(
+        row(55)["OA_Total"] + row(55)["SA_Total"]
+    )
+
+    payout = row(default_inputs.payout_age)["CPF_Life_Payout_Annual"] / 12
+    years = default_inputs.payout_age - default_inputs.current_age
+    assert summary.cpf_life_monthly_nominal == pytest.approx(payout)
+    assert summary.cpf_life_monthly_real == pytest.approx(
+        payout / (1 + default_inputs.inflation_rate) ** years
+    )
+
+    retired = df[df["Age"] >= default_inputs.retire_age]
+    assert summary.min_accessible_liquidity == pytest.approx(
+        retired["Accessible_Liquidity"].min()
+    )
+
+
+def test_summary_depletion_age(default_inputs):
+    """Depletion age is the first retired year with no accessible funds."""
+    default_inputs.spend_bridge = 20000.0
+    df, summary = run_simulation_with_summary(default_inputs)
+
+    assert summary.bridge_safe is False
+    retired = df[df["Age"] >= default_inputs.retire_age]
+    first_empty = retired[retired["Accessible_Liquidity"] <= 0]["Age"].iloc[0]
+    assert summary.depletion_age == first_empty
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"retire_age": 50},
+        {"retire_age": 60, "house_loan_amt": 300000.0, "house_start_age": 38},
+        {"car_loan_amt": 40000.0, "car_start_age": 33, "car_downpayment": 10000.0},
+        {"current_age": 22, "retire_age": 80, "cash_apy": 0.0},
+    ],
+)
+def test_closed_form_matches_year_loop(default_inputs, overrides):
+    """Jumping across event-free working years reproduces the plain loop."""
+    for key, value in overrides.items():
+        setattr(default_inputs, key, value)
+
+    fast, fast_summary = run_simulation_with_summary(default_inputs, closed_form=True)
+    slow, slow_summary = run_simulation_with_summary(default_inputs)
+
+    assert list(fast.columns) == list(slow.columns)
+    for column in slow.columns:
+        assert fast[column].to_numpy() == pytest.approx(
+            slow[column].to_numpy(), rel=1e-9
+        )
+    assert fast_summary.bridge_safe == slow_summary.bridge_safe
+    assert fast_summary.bridge_cash_left == pytest.approx(
+        slow_summary.bridge_cash_left, rel=1e-9
+    )
+
+
+def test_quiet_runs_stop_at_events(default_inputs):
+    """The analytic jump ends at retirement and at the first loan year."""
+    default_inputs.retire_age = 50
+
+    def runs():
+        return quiet_runs(
+            default_inputs,
+            house_payment(default_inputs),
+            build_schedule(default_inputs),
+        )
+
+    assert runs()[0] == 20
+
+    default_inputs.house_loan_amt = 300000.0
+    default_inputs.house_start_age = 35
+    assert runs()[0] == 5
@@ -0,0 +1,72 @@
+# tests/test_events.py
+import pytest
+from src.engine import run_simulation
+from src.events import build_schedule, events_from_records
+from src.models import LifeEvent
+
+
+def test_schedule_aggregates_events(default_inputs):
+    """Events collapse into one dense per-year array per account."""
+    default_inputs.events = [
+        LifeEvent("windfall", 50000.0, 35),
+        LifeEvent("expense", 20000.0, 35, account="cash"),
+        LifeEvent("topup", 100.0, 31, 33, account="sa"),
+        LifeEvent("spend_change", -500.0, 60),
+    ]
+    schedule = build_schedule(default_inputs)
+
+    assert schedule.cash[35 - 30] == 30000.0
+    assert schedule.cash.sum() == 30000.0
+    assert list(schedule.sa[:5]) == [0.0, 1200.0, 1200.0, 1200.0, 0.0]
+    assert (schedule.spend[: 60 - 30] == 0).all()
+    assert (schedule.spend[60 - 30 :] == -500.0).all()
+
+
+def test_car_loan_is_a_scheduled_expense(default_inputs):
+    """The fixed car fields become cash events over the loan tenure."""
+    default_inputs.car_loan_amt = 50000.0
+    default_inputs.car_start_age = 32
+    default_inputs.car_tenure = 2
+    default_inputs.car_downpayment = 10000.0
+    schedule = build_schedule(default_inputs)
+
+    car_pmt = (50000.0 + 50000.0 * default_inputs.car_rate * 2) / 2
+    assert schedule.cash[2] == pytest.approx(-(10000.0 + car_pmt))
+    assert schedule.cash[3] == pytest.approx(-car_pmt)
+    assert schedule.cash[4] == 0.0
+
+
+def test_windfall_lands_in_cash(default_inputs):
+    """A one-off windfall raises cash by exactly its amount from that year."""
+    baseline = run_simulation(default_inputs)
+    default_inputs.events = [LifeEvent("windfall", 100000.0, 35)]
+    with_event = run_simulation(default_inputs)
+
+    diff = with_event["Liquid_Cash_Balance"] - baseline["Liquid_Cash_Balance"]
+    assert (diff[:5] == 0).all()
+    assert diff[5] == pytest.approx(100000.0)
+    assert diff[6] == pytest.approx(100000.0 * (1 + default_inputs.cash_apy))
+
+
+def test_spend_change_moves_phase_target(default_inputs):
+    default_inputs.events = [LifeEvent("spend_change", 1000.0, 45, 49)]
+    df = run_simulation(default_inputs)
+
+    targets = df.set_index("Age")["Phase_Target"]
+    assert targets[44] == default_inputs.spend_bridge
+    assert targets[45] == default_inputs.spend_bridge + 1000.0
+    assert targets[50] == default_inputs.spend_bridge
+
+
+def test_events_from_records_skips_blank_rows():
+    records = [
+        {"kind": "windfall", "amount": 5000, "start_age": 40, "end_age": None},
+        {"kind": "expense", "amount": 100, "start_age": 41, "end_age": float("nan")},
+        {"kind": None, "amount": None, "start_age": None},
+    ]
+    events = events_from_records(records)
+
+    assert events == [
+        LifeEvent("windfall", 5000.0, 40),
+        LifeEvent("expense", 100.0, 41),
+    ]
@@ -0,0 +1,74 @@
+# tests/test_export.py
+import dataclasses
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.batch import RatePaths, run_batch
+from src.constants import ENGINE_VERSION
+from src.engine import run_simulation, run_simulation_with_summary
+from src.export import (
+    export_info,
+    export_summary,
+    read_results,
+    results_bytes,
+    write_batch_results,
+    write_results,
+)
+
+
+@pytest.mark.parametrize("suffix", [".feather", ".parquet"])
+def test_single_run_round_trips_with_metadata(default_inputs, tmp_path, suffix):
+    df, summary = run_simulation_with_summary(default_inputs)
+    path = tmp_path / f"run{suffix}"
+    write_results(df, path, default_inputs, summary=summary)
+
+    table = read_results(path)
+    pd.testing.assert_frame_equal(table.to_pandas(), df)
+    version, inputs = export_info(table)
+    assert version == ENGINE_VERSION
+    assert inputs["retire_age"] == default_inputs.retire_age
+    assert export_summary(table) == dataclasses.asdict(summary)
+
+
+def test_results_bytes_match_file_export(default_inputs, tmp_path):
+    df = run_simulation(default_inputs)
+    path = tmp_path / "run.parquet"
+    write_results(df, path)
+    assert results_bytes(df) == path.read_bytes()
+
+
+@pytest.mark.parametrize("suffix", [".arrow", ".parquet"])
+def test_batch_chunks_stream_in_long_layout(default_inputs, tmp_path, suffix):
+    rates = RatePaths.constant(default_inputs, 5)
+    rates.oa_apy += np.linspace(-0.02, 0.02, 5)[:, None]
+    first = run_batch(default_inputs, rates, dtype=np.float32)
+    second = run_batch(default_inputs, RatePaths.constant(default_inputs, 2))
+    chunks = [first, second.compact(np.float32)]
+
+    path = tmp_path / f"batch{suffix}"
+    write_batch_results(iter(chunks), path, default_inputs, chunk_paths=2)
+
+    table = read_results(path)
+    n_years = len(first.ages)
+    assert table.num_rows == 7 * n_years
+    assert table.schema.field("Net_Worth").type == "float"
+    assert export_info(table)[0] == ENGINE_VERSION
+
+    paths = table.column("Path").to_numpy()
+    np.testing.assert_array_equal(np.unique(paths), np.arange(7))
+    net_worth = table.column("Net_Worth").to_numpy().reshape(7, n_years)
+    np.testing.assert_array_equal(net_worth[:5], first.columns["Net_Worth"])
+    np.testing.assert_array_equal(net_worth[5:], second.compact().columns["Net_Worth"])
+    min_liquidity = table.column("Min_Accessible_Liquidity").to_numpy()
+    np.testing.assert_array_equal(
+        min_liquidity[::n_years],
+        np.concatenate(
+            [first.min_accessible_liquidity, second.min_accessible_liquidity]
+        ),
+    )
+
+
+def test_unknown_format_is_rejected(default_inputs, tmp_path):
+    with pytest.raises(ValueError, match="Unknown export format"):
+        write_results(run_simulation(default_inputs), tmp_path / "run.csv")
@@ -0,0 +1,84 @@
+# tests/test_jobs.py
+import threading
+
+import pytest
+from src.jobs import JobManager, fingerprint
+from src.parallel import SimulationCancelled
+
+
+def _until_cancelled(started, progress=None, cancel=None):
+    started.set()
+    progress(0, 1)
+    cancel.wait(5)
+    raise SimulationCancelled()
+
+
+def _add(a, b, progress=None, cancel=None):
+    progress(1, 1)
+    return a + b
+
+
+def test_fingerprint_follows_values(default_inputs):
+    key = fingerprint(default_inputs, 1000)
+    assert fingerprint(default_inputs, 1000) == key
+    assert fingerprint(default_inputs, 2000) != key
+
+    default_inputs.retire_age += 1
+    assert fingerprint(default_inputs, 1000) != key
+
+
+def test_job_delivers_result_and_progress():
+    jobs = JobManager()
+    job = jobs.submit("sum", "k", _add, 2, 3)
+    assert job.future.result(timeout=5) == 5
+    assert job.status == "done"
+    assert job.fraction == 1.0
+    # Same key: the finished job is reused, not rerun
+    assert jobs.submit("sum", "k", _add, 2, 3) is job
+    jobs.shutdown()
+
+
+def _fail(progress=None, cancel=None):
+    raise RuntimeError("boom")
+
+
+def test_failed_job_is_not_resubmitted():
+    jobs = JobManager()
+    job = jobs.submit("mc", "k", _fail)
+    with pytest.raises(RuntimeError):
+        job.future.result(timeout=5)
+    assert job.status == "failed"
+    # A rerun with the same inputs keeps showing the failure
+    assert jobs.submit("mc", "k", _fail) is job
+    jobs.shutdown()
+
+
+def test_new_key_supersedes_running_job():
+    jobs = JobManager()
+    started = threading.Event()
+    old = jobs.submit("mc", "old", _until_cancelled, started)
+    assert started.wait(5)
+    assert old.status == "running"
+
+    new = jobs.submit("mc", "new", _add, 1, 1)
+    assert new.future.result(timeout=5) == 2
+    assert old.status == "cancelled"
+    with pytest.raises(SimulationCancelled):
+        old.future.result()
+    assert jobs.get("mc") is new
+    jobs.shutdown()
+
+
+def test_reap_cancels_jobs_of_closed_sessions():
+    jobs = JobManager(max_workers=2)
+    started = threading.Event()
+    closed = jobs.submit(("gone", "mc"), "k", _until_cancelled, started)
+    assert started.wait(5)
+    kept = jobs.submit(("alive", "mc"), "k", _add, 1, 2)
+
+    assert jobs.reap(lambda slot: slot[0] == "alive") == 1
+    with pytest.raises(SimulationCancelled):
+        closed.future.result(timeout=5)
+    assert jobs.get(("gone", "mc")) is None
+    assert jobs.get(("alive", "mc")) is kept
+    jobs.shutdown()
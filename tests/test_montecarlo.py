@@ -0,0 +1,62 @@
+# tests/test_montecarlo.py
+import numpy as np
+import pytest
+from src.montecarlo import AgeHistogram, MarketAssumptions, run_monte_carlo
+
+
+def test_histogram_quantiles_within_error_bound():
+    """Streamed quantiles stay within the documented bound of exact ones."""
+    rng = np.random.default_rng(7)
+    values = rng.lognormal(mean=13, sigma=1.5, size=(20_000, 3))
+    values[:500] = 0.0  # depleted paths sit in the underflow bin
+
+    histogram = AgeHistogram(n_ages=3)
+    for block in np.array_split(values, 7):
+        histogram.add(block)
+
+    assert histogram.total == len(values)
+    for q in (0.01, 0.05, 0.5, 0.95):
+        exact = np.quantile(values, q, axis=0, method="inverted_cdf")
+        estimate = histogram.quantile(q)
+        tolerance = np.maximum(exact * histogram.rel_error_bound, histogram.lo)
+        assert np.all(np.abs(estimate - exact) <= tolerance)
+
+
+def test_monte_carlo_is_deterministic(default_inputs):
+    """The same seed gives identical percentiles and success counts."""
+    assumptions = MarketAssumptions()
+    first = run_monte_carlo(
+        default_inputs, assumptions, 2_500, seed=3, chunk_size=1_000
+    )
+    second = run_monte_carlo(
+        default_inputs, assumptions, 2_500, seed=3, chunk_size=1_000
+    )
+
+    assert first.n_paths == 2_500
+    assert first.percentiles.equals(second.percentiles)
+    assert first.success_rate == second.success_rate
+
+
+def test_zero_volatility_matches_deterministic_run(default_inputs):
+    """Without volatility every percentile collapses onto the single run."""
+    from src.engine import run_simulation
+
+    assumptions = MarketAssumptions(oa_vol=0.0, sa_vol=0.0, inflation_vol=0.0)
+    result = run_monte_carlo(default_inputs, assumptions, 100, chunk_size=40)
+    expected = run_simulation(default_inputs)["Net_Worth_Real"].to_numpy()
+
+    for column in ["P5", "P50", "P95"]:
+        estimate = result.percentiles[column].to_numpy()
+        assert estimate == pytest.approx(expected, rel=result.rel_error_bound)
+    assert result.success_rate in (0.0, 1.0)
+
+
+def test_empty_horizon_gives_empty_result(default_inputs):
+    """current_age past life_expectancy simulates no years instead of raising."""
+    default_inputs.current_age = 80
+    default_inputs.life_expectancy = 70
+
+    result = run_monte_carlo(default_inputs, MarketAssumptions(), 100, chunk_size=50)
+    assert result.percentiles.empty
+    assert "P50" in result.percentiles
+    assert np.isnan(result.success_rate)
@@ -0,0 +1,70 @@
+# tests/test_mortality.py
+import dataclasses
+
+import numpy as np
+import pytest
+from src.batch import RatePaths
+from src.engine import run_simulation_with_summary
+from src.mortality import (
+    MAX_AGE,
+    death_probabilities,
+    evaluate_longevity,
+    evaluate_longevity_paths,
+    load_life_table,
+)
+
+
+def test_life_table_is_closed():
+    for sex in ("male", "female", "unisex"):
+        qx = load_life_table(sex)
+        assert len(qx) == MAX_AGE + 1
+        assert qx[-1] == 1.0
+        assert death_probabilities(qx, 45).sum() == pytest.approx(1.0)
+
+
+def test_ruin_probability_matches_rerunning_every_horizon(default_inputs):
+    """One max-horizon run gives the same answer as one run per death age."""
+    default_inputs.spend_unlock = 6000.0
+    default_inputs.spend_late = 6000.0
+    outcome = evaluate_longevity(default_inputs)
+    assert outcome.depletion_age is not None
+
+    deaths = death_probabilities(load_life_table(), default_inputs.current_age)
+    brute_force = 0.0
+    for offset, p_death in enumerate(deaths):
+        horizon = dataclasses.replace(
+            default_inputs, life_expectancy=default_inputs.current_age + offset
+        )
+        if run_simulation_with_summary(horizon)[1].depletion_age is not None:
+            brute_force += p_death
+
+    assert outcome.ruin_probability == pytest.approx(brute_force)
+    assert 0 < outcome.ruin_probability < 1
+
+
+def test_paths_match_single_run(default_inputs):
+    """The vectorized batch reproduces the scalar outcome on constant rates."""
+    default_inputs.spend_late = 8000.0
+    outcome = evaluate_longevity(default_inputs)
+
+    full = dataclasses.replace(default_inputs, life_expectancy=MAX_AGE)
+    batch = evaluate_longevity_paths(default_inputs, RatePaths.constant(full, 3))
+
+    assert batch["Ruin_Probability"].to_numpy() == pytest.approx(
+        [outcome.ruin_probability] * 3
+    )
+    assert batch["Expected_Bequest_Real"].to_numpy() == pytest.approx(
+        [outcome.expected_bequest_real] * 3
+    )
+
+
+def test_never_depleted_has_no_ruin(default_inputs):
+    default_inputs.spend_bridge = 0.0
+    default_inputs.spend_unlock = 0.0
+    default_inputs.spend_late = 0.0
+    outcome = evaluate_longevity(default_inputs)
+
+    assert outcome.depletion_age is None
+    assert outcome.ruin_probability == 0.0
+    assert outcome.expected_years_depleted == 0.0
+    assert np.isfinite(outcome.expected_bequest_real)
@@ -0,0 +1,74 @@
+# tests/test_parallel.py
+import dataclasses
+import threading
+
+import numpy as np
+import pytest
+from src.batch import run_sweep
+from src.engine import run_simulation
+from src.montecarlo import MarketAssumptions, run_monte_carlo
+from src.parallel import SimulationCancelled, make_shards, scaling_report
+
+
+def test_shards_do_not_depend_on_worker_count():
+    """Shard boundaries and seeds are a function of the item count only."""
+    shards = make_shards(1050, 500, seed=9)
+    assert [(s.start, s.stop) for s in shards] == [(0, 500), (500, 1000), (1000, 1050)]
+
+    again = make_shards(1050, 500, seed=9)
+    for a, b in zip(shards, again):
+        assert a.seed_seq.generate_state(4).tolist() == (
+            b.seed_seq.generate_state(4).tolist()
+        )
+
+
+def test_monte_carlo_bit_identical_across_workers(default_inputs):
+    """A pool of any size reproduces the single-process result exactly."""
+    kwargs = dict(n_paths=3_000, seed=5, chunk_size=700)
+    serial = run_monte_carlo(default_inputs, MarketAssumptions(), **kwargs)
+    pooled = run_monte_carlo(default_inputs, MarketAssumptions(), workers=3, **kwargs)
+
+    assert serial.percentiles.equals(pooled.percentiles)
+    assert serial.success_rate == pooled.success_rate
+
+
+def test_sweep_writes_rows_in_place(default_inputs):
+    """Sweep rows match single runs, padded with NaN past each horizon."""
+    scenarios = [
+        dataclasses.replace(default_inputs, retire_age=age, life_expectancy=80 + i)
+        for i, age in enumerate(range(40, 46))
+    ]
+    serial = run_sweep(scenarios, shard_size=4)
+    pooled = run_sweep(scenarios, shard_size=4, workers=2)
+
+    np.testing.assert_array_equal(serial, pooled)
+    for row, inputs in zip(serial, scenarios):
+        expected = run_simulation(inputs)["Net_Worth"].to_numpy()
+        assert row[: len(expected)] == pytest.approx(expected)
+        assert np.isnan(row[len(expected) :]).all()
+
+
+def test_progress_and_cancellation(default_inputs):
+    """Progress is reported per shard and a set cancel event stops the run."""
+    calls = []
+    run_monte_carlo(
+        default_inputs,
+        MarketAssumptions(),
+        1_000,
+        chunk_size=250,
+        progress=lambda done, total: calls.append((done, total)),
+    )
+    assert calls == [(1, 4), (2, 4), (3, 4), (4, 4)]
+
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(SimulationCancelled):
+        run_monte_carlo(
+            default_inputs, MarketAssumptions(), 1_000, chunk_size=250, cancel=cancel
+        )
+
+
+def test_scaling_report_columns():
+    report = scaling_report(lambda workers: None, worker_counts=(1, 2))
+    assert list(report.columns) == ["Workers", "Seconds", "Speedup", "Efficiency"]
+    assert report["Speedup"].iloc[0] == 1.0
@@ -0,0 +1,72 @@
+# tests/test_scenarios.py
+import numpy as np
+import pytest
+from src.batch import RatePaths
+from src.montecarlo import run_monte_carlo
+from src.scenarios import Regime, ScenarioModel, open_cube, write_cube
+
+
+def test_sampled_factors_follow_covariance(default_inputs):
+    """Draws reproduce the requested means, volatilities and correlation."""
+    corr = np.eye(4)
+    corr[1, 2] = corr[2, 1] = 0.8
+    model = ScenarioModel.from_inputs(
+        default_inputs, vols=(0.01, 0.1, 0.1, 0.01), corr=corr
+    )
+    draws = model.sample(np.random.default_rng(0), 50_000, 2).reshape(-1, 4)
+
+    assert draws.mean(axis=0) == pytest.approx(model.regimes[0].means, abs=2e-3)
+    assert draws.std(axis=0) == pytest.approx([0.01, 0.1, 0.1, 0.01], rel=0.02)
+    assert np.corrcoef(draws[:, 1], draws[:, 2])[0, 1] == pytest.approx(0.8, abs=0.01)
+
+
+def test_regime_switching_is_sticky():
+    """Paths stay in an absorbing regime once they enter it."""
+    calm = Regime(means=np.zeros(4), cov=np.zeros((4, 4)))
+    crash = Regime(means=np.full(4, -0.2), cov=np.zeros((4, 4)))
+    model = ScenarioModel(
+        regimes=[calm, crash],
+        transition=np.array([[0.5, 0.5], [0.0, 1.0]]),
+        initial=np.array([1.0, 0.0]),
+    )
+    draws = model.sample(np.random.default_rng(1), 1_000, 10)[:, :, 0]
+
+    assert (draws[:, 0] == 0).all()
+    in_crash = draws < 0
+    # Once a path crashes it never recovers
+    assert (np.diff(in_crash.astype(int), axis=1) >= 0).all()
+    assert in_crash[:, -1].mean() == pytest.approx(1 - 0.5**9, abs=0.01)
+
+
+def test_cube_round_trip_and_engine_view(tmp_path, default_inputs):
+    """A written cube reopens read-only and feeds the engine without copying."""
+    model = ScenarioModel.from_inputs(default_inputs)
+    path = str(tmp_path / "cube.npy")
+    written = np.array(write_cube(path, model, 1_200, 60, seed=4, chunk_size=500))
+
+    cube = open_cube(path)
+    assert isinstance(cube, np.memmap)
+    np.testing.assert_array_equal(cube, written)
+    np.testing.assert_array_equal(
+        np.array(write_cube(path, model, 1_200, 60, seed=4, chunk_size=500)), written
+    )
+
+    rates = RatePaths.from_cube(cube, 56, start=100, stop=200)
+    assert np.shares_memory(rates.oa_apy, cube)
+    np.testing.assert_array_equal(rates.inflation_rate, cube[100:200, :56, 3])
+
+    with pytest.raises(ValueError):
+        RatePaths.from_cube(cube, 61)
+
+
+def test_monte_carlo_reads_cube(tmp_path, default_inputs):
+    """Runs over a shared cube are reproducible and need no new draws."""
+    path = str(tmp_path / "cube.npy")
+    write_cube(path, ScenarioModel.from_inputs(default_inputs), 900, 56)
+
+    first = run_monte_carlo(default_inputs, path, 900, chunk_size=400)
+    second = run_monte_carlo(default_inputs, path, 900, chunk_size=300, workers=2)
+    assert first.percentiles.equals(second.percentiles)
+
+    with pytest.raises(ValueError):
+        run_monte_carlo(default_inputs, path, 1_000, chunk_size=400)